@@ -0,0 +1,87 @@
+import importlib
+import os
+
+from flask import Flask
+from flask_login import LoginManager
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from .config import Config, configure_engines
+from .models import db, User
+from .users import user_cache
+from .notifications import notifier
+from .passwords import hasher
+from . import ratelimit
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Blueprint name -> module holding it as `bp`. Only the ones named in
+# config BLUEPRINTS are imported, when the app is created.
+BLUEPRINTS = {
+    "auth": ".auth",
+    "student": ".student",
+    "admin": ".admin",
+    "api": ".api",
+    "debug": ".debug",
+}
+
+# APP_ENV values that may serve the debug blueprint
+DEBUG_ENVS = ("development", "testing")
+
+login_manager = LoginManager()
+login_manager.login_view = "auth.login"  # Redirect to login if not authenticated
+login_manager.login_message = "Please log in to access this page."
+login_manager.login_message_category = "error"
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    return user_cache.load(int(user_id), db.session, User)
+
+
+def create_app(config=None) -> Flask:
+    """
+    Build the Flask app.
+
+    Args:
+        config: Settings applied over Config: a dict, or an object/class
+            whose upper-case attributes are read (as app.config.from_object)
+
+    Returns:
+        The configured app with its blueprints and CLI commands registered
+    """
+    from flask_migrate import Migrate
+    from . import cli
+
+    app = Flask(__name__,
+                template_folder=os.path.join(base_dir, 'templates'),
+                static_folder=os.path.join(base_dir, 'static'))
+
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    db.init_app(app)
+    Migrate(app, db)
+    login_manager.init_app(app)
+    notifier.init_app(app)
+    hasher.init_app(app)
+    ratelimit.init_app(app)
+
+    hops = app.config["PROXY_FIX_HOPS"]
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+    with app.app_context():
+        configure_engines(db)
+
+    debug = app.config["APP_ENV"] in DEBUG_ENVS
+    for name in app.config["BLUEPRINTS"]:
+        if name == "debug" and not debug:
+            continue
+        module = importlib.import_module(BLUEPRINTS[name], __name__)
+        app.register_blueprint(module.bp)
+
+    cli.init_app(app)
+    return app
@@ -0,0 +1,467 @@
+from flask import Blueprint, current_app, jsonify, request, render_template, redirect, flash, stream_with_context
+from flask_login import login_required, current_user
+from datetime import date, datetime, time
+from .models import db, User, Booking, BlockedDate
+from .helpers import admin_required
+from .cache import booking_versions
+from .events import publish_booking_change
+from .notifications import notifier, notify_booking
+from .reservations import with_calendar_lock, ReservationBusy
+from .identity import current_identity
+from .conflicts import conflict_index, resolve_approvals
+from . import queries, analytics, export
+
+bp = Blueprint("admin", __name__)
+
+@bp.route("/admin/approve-user/<int:user_id>", methods=["POST"])
+@admin_required
+def approve_user(user_id):
+    user = User.query.get(user_id)
+    if user and user.status == "pending":
+        user.status = "approved"
+        db.session.commit()
+        notifier.notify(user.id, "Your account has been approved. You can now log in.", "Account approved")
+        flash(f"User {user.username} has been approved.", "success")
+    return redirect("/admin/signup-approvals")
+
+@bp.route("/admin/deny-user/<int:user_id>", methods=["POST"])
+@admin_required
+def deny_user(user_id):
+    user = User.query.get(user_id)
+    if user and user.status == "pending":
+        db.session.delete(user)
+        db.session.commit()
+        flash(f"User {user.username} has been denied and removed.", "info")
+    return redirect("/admin/signup-approvals")
+
+@bp.route("/admin/dashboard")
+@login_required
+def admin_dashboard():
+    if current_identity().role != "admin":
+        flash("Access denied. Admin login required.", "error")
+        return redirect("/login")
+    
+    # Figures for lessons in the last 30 days, from the daily rollups
+    start, end = analytics.default_range()
+    stats = analytics.summary(db.session, start, end)
+    return render_template("admin/dashboard.html", stats=stats)
+
+@bp.route("/api/admin/analytics")
+@admin_required
+def analytics_api():
+    """
+    Get booking, minutes, revenue and approval-rate figures per lesson day.
+    Query params: from, to (dates, to exclusive; default the last 30 days),
+    tutor_id (default all tutors). Reads one rollup row per day and tutor.
+    """
+    start, end = analytics.default_range()
+    try:
+        if request.args.get('from'):
+            start = date.fromisoformat(request.args['from'])
+        if request.args.get('to'):
+            end = date.fromisoformat(request.args['to'])
+        tutor_id = int(request.args['tutor_id']) if request.args.get('tutor_id') else None
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid parameters"}), 400
+    
+    if end <= start or (end - start).days > 3660:
+        return jsonify({"success": False, "error": "Invalid date range"}), 400
+    
+    return jsonify({
+        "success": True,
+        "totals": analytics.summary(db.session, start, end, tutor_id),
+        "days": analytics.daily(db.session, start, end, tutor_id)
+    })
+
+@bp.route("/admin/home")
+@admin_required
+def admin_home():
+    return render_template("index.html")
+
+@bp.route("/admin/calendar")
+@admin_required
+def admin_calendar():
+    return render_template("admin/calendar.html")
+
+@bp.route("/admin/booking-approvals")
+@admin_required
+def admin_booking_approvals():
+    pending_count = Booking.query.filter_by(status="pending").count()
+    return render_template("admin/booking-approvals.html", pending_count=pending_count)
+
+@bp.route("/api/admin/bookings")
+@admin_required
+def admin_bookings_api():
+    """
+    Get all pending bookings for admin approval.
+    Returns JSON list of bookings with student info.
+    """
+    status_filter = request.args.get('status', 'pending')
+    
+    # One joined query for bookings and their students (no per-row lookups)
+    rows = queries.admin_booking_rows(status_filter)
+    
+    bookings_data = []
+    for row in rows:
+        data = queries.serialize_booking(row)
+        data['student_name'] = f"{row.student_username or row.student_email}"
+        data['student_email'] = row.student_email
+        bookings_data.append(data)
+    
+    return jsonify({"success": True, "bookings": bookings_data})
+
+@bp.route("/api/admin/blocked-dates", methods=["GET", "POST"])
+@admin_required
+def blocked_dates_api():
+    """
+    List or add the current tutor's one-off blocked dates.
+    POST body: {"date": "2030-04-15", "start_time": "10:00", "end_time": "12:00",
+    "reason": "..."}; leave out the times to block the whole day.
+    """
+    if request.method == "GET":
+        rows = BlockedDate.query.filter(
+            BlockedDate.user_id == current_user.id,
+            BlockedDate.date >= datetime.utcnow().date()
+        ).order_by(BlockedDate.date).all()
+        return jsonify({"success": True, "blocked_dates": [{
+            "id": row.id,
+            "date": row.date.isoformat(),
+            "start_time": row.start_time.strftime("%H:%M") if row.start_time else None,
+            "end_time": row.end_time.strftime("%H:%M") if row.end_time else None,
+            "reason": row.reason
+        } for row in rows]})
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        blocked_on = date.fromisoformat(data["date"])
+        start_time = time.fromisoformat(data["start_time"]) if data.get("start_time") else None
+        end_time = time.fromisoformat(data["end_time"]) if data.get("end_time") else None
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid date or time"}), 400
+    
+    if (start_time is None) != (end_time is None) or (start_time and end_time <= start_time and end_time != time(0)):
+        return jsonify({"success": False, "error": "Give both start_time and end_time, with end after start"}), 400
+    
+    row = BlockedDate(user_id=current_user.id, date=blocked_on, start_time=start_time,
+                      end_time=end_time, reason=(data.get("reason") or "")[:120] or None)
+    db.session.add(row)
+    db.session.commit()
+    booking_versions.bump(current_user.id)
+    
+    return jsonify({"success": True, "id": row.id}), 201
+
+@bp.route("/api/admin/blocked-dates/<int:blocked_id>", methods=["DELETE"])
+@admin_required
+def delete_blocked_date(blocked_id):
+    row = BlockedDate.query.get(blocked_id)
+    if not row or row.user_id != current_user.id:
+        return jsonify({"success": False, "error": "Blocked date not found"}), 404
+    
+    db.session.delete(row)
+    db.session.commit()
+    booking_versions.bump(current_user.id)
+    return jsonify({"success": True})
+
+@bp.route("/api/admin/bookings/export")
+@admin_required
+def export_bookings_api():
+    """
+    Download bookings with their tutor and student as CSV, or Parquet/Arrow
+    when pyarrow is installed. Streamed in chunks, so any size works.
+    Query params: format (csv, parquet, arrow), from, to (lesson start
+    dates), tutor_id, status (comma separated), after_id (resume after the
+    last id received).
+    """
+    file_format = request.args.get('format', 'csv')
+    if file_format not in export.available_formats():
+        return jsonify({"success": False, "error": f"Format must be one of {', '.join(export.available_formats())}"}), 400
+    
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+        tutor_id = int(request.args['tutor_id']) if request.args.get('tutor_id') else None
+        after_id = int(request.args['after_id']) if request.args.get('after_id') else None
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid parameters"}), 400
+    statuses = [status for status in request.args.get('status', '').split(',') if status]
+    
+    chunks = export.booking_chunks(db.session, start, end, tutor_id, statuses, after_id)
+    mimetype, extension = export.FORMATS[file_format]
+    response = current_app.response_class(stream_with_context(export.write(chunks, file_format)), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=bookings.{extension}"
+    return response
+
+@bp.route("/admin/bookings/<int:booking_id>/approve", methods=["POST"])
+@admin_required
+def approve_booking(booking_id):
+    """
+    Approve a pending booking request.
+    Automatically denies conflicting pending bookings.
+    """
+    booking = Booking.query.get(booking_id)
+    
+    if not booking:
+        return jsonify({"success": False, "error": "Booking not found"}), 404
+    
+    if booking.status != "pending":
+        return jsonify({"success": False, "error": f"Booking is already {booking.status}"}), 400
+    
+    conflicting_ids = []
+    
+    def approve():
+        del conflicting_ids[:]
+        
+        # Re-check under the calendar lock: another request may have changed it
+        db.session.refresh(booking)
+        if booking.status != "pending":
+            return f"Booking is already {booking.status}"
+        if queries.accepted_conflict(booking.tutor_id, booking.start_time, booking.end_time):
+            return "This time slot is already booked"
+        
+        # Check for conflicting pending bookings and deny them. Read from the
+        # database, not conflict_index: a booking committed just before we
+        # took the lock (or by another worker) may not be in the index yet.
+        conflicting_ids.extend(other.id for other in queries.pending_overlaps(
+            booking.tutor_id, booking.start_time, booking.end_time, exclude_id=booking_id
+        ))
+        
+        conflicting_ids[:] = analytics.change_status(db.session, conflicting_ids, "pending", "denied")
+        
+        # Approve the booking
+        booking.status = "accepted"
+        analytics.record_transitions(db.session, [booking], "pending", "accepted")
+    
+    try:
+        error = with_calendar_lock(db.session, [booking.tutor_id], approve)
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "The calendar is busy, please try again"}), 503
+    
+    if error:
+        return jsonify({"success": False, "error": error}), 409
+    
+    conflict_index.discard(booking.tutor_id, conflicting_ids)
+    conflict_index.record(booking)
+    booking_versions.bump(booking.tutor_id)
+    publish_booking_change(booking.tutor_id, booking.student_id, booking.id, booking.status)
+    notify_booking(booking.student_id, booking.status, booking.start_time)
+    for conflict_id, (student_id, start_time) in queries.booking_students(conflicting_ids).items():
+        publish_booking_change(booking.tutor_id, student_id, conflict_id, "denied")
+        notify_booking(student_id, "denied", start_time)
+    
+    return jsonify({
+        "success": True,
+        "message": "Booking approved successfully",
+        "denied_conflicts": len(conflicting_ids)
+    })
+
+@bp.route("/api/admin/bookings/bulk", methods=["POST"])
+@admin_required
+def bulk_booking_actions():
+    """
+    Approve and/or deny many pending bookings in one transaction.
+    Body: {"actions": [{"id": 1, "action": "approve"}, {"id": 2, "action": "deny"}, ...]}
+    Approvals that overlap an accepted booking, or each other, are resolved in
+    one sorted pass (earliest start wins) and the losers are denied, as are
+    other pending bookings overlapping an approved one.
+    Returns an outcome per id.
+    """
+    data = request.get_json()
+    if not data or not isinstance(data.get("actions"), list):
+        return jsonify({"success": False, "error": "actions list required"}), 400
+    
+    requested = {}
+    outcomes = {}
+    for item in data["actions"]:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            return jsonify({"success": False, "error": "Each action needs an integer id"}), 400
+        if item.get("action") not in ("approve", "deny"):
+            outcomes[item["id"]] = "invalid_action"
+        else:
+            requested[item["id"]] = item["action"]
+    
+    try:
+        denied_conflicts = apply_booking_actions(requested, outcomes)
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "The calendar is busy, please try again"}), 503
+    
+    return jsonify({
+        "success": True,
+        "results": [{"id": item["id"], "outcome": outcomes[item["id"]]} for item in data["actions"]],
+        "denied_conflicts": denied_conflicts
+    })
+
+@bp.route("/api/admin/series/<series_id>", methods=["POST"])
+@admin_required
+def series_action(series_id):
+    """
+    Approve or deny every pending lesson of a series in one transaction.
+    Body: {"action": "approve"} or {"action": "deny"}. Lessons that clash
+    with an accepted booking are denied instead of approved.
+    """
+    data = request.get_json(silent=True) or {}
+    action = data.get("action")
+    if action not in ("approve", "deny"):
+        return jsonify({"success": False, "error": "action must be approve or deny"}), 400
+    
+    booking_ids = [row.id for row in db.session.query(Booking.id).filter(
+        Booking.series_id == series_id,
+        Booking.status == "pending"
+    )]
+    if not booking_ids:
+        return jsonify({"success": False, "error": "No pending lessons in this series"}), 404
+    
+    outcomes = {}
+    try:
+        denied_conflicts = apply_booking_actions({booking_id: action for booking_id in booking_ids}, outcomes)
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "The calendar is busy, please try again"}), 503
+    
+    counts = {}
+    for outcome in outcomes.values():
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return jsonify({"success": True, "outcomes": counts, "denied_conflicts": denied_conflicts})
+
+def apply_booking_actions(requested: dict, outcomes: dict) -> int:
+    """
+    Approve/deny pending bookings in one transaction under their tutors'
+    calendar locks, then update the conflict index, caches, live calendars
+    and students.
+    
+    Args:
+        requested: booking_id -> "approve" or "deny"
+        outcomes: Filled with booking_id -> outcome (accepted, denied,
+            denied_conflict, already_<status>, not_found)
+    
+    Returns:
+        Number of other pending bookings denied for overlapping an approval
+    
+    Raises:
+        ReservationBusy: If the calendars stay locked by other requests
+    """
+    tutor_ids = [row.tutor_id for row in db.session.query(Booking.tutor_id).filter(
+        Booking.id.in_(requested)).distinct()]
+    
+    changes = {}  # booking_id -> (tutor_id, new_status, start, end)
+
+    def apply_actions():
+        changes.clear()
+        rows = db.session.query(
+            Booking.id, Booking.tutor_id, Booking.status, Booking.start_time, Booking.end_time
+        ).filter(Booking.id.in_(requested)).all()
+        found = {row.id: row for row in rows}
+        
+        candidates = []
+        for booking_id, action in requested.items():
+            row = found.get(booking_id)
+            if row is None:
+                outcomes[booking_id] = "not_found"
+            elif row.status != "pending":
+                outcomes[booking_id] = f"already_{row.status}"
+            elif action == "deny":
+                outcomes[booking_id] = "denied"
+                changes[booking_id] = (row.tutor_id, "denied", row.start_time, row.end_time)
+            else:
+                candidates.append((row.tutor_id, row.start_time, row.end_time, booking_id))
+        
+        # Accepted bookings each candidate could clash with, one range query per tutor
+        accepted = {}
+        for tutor_id in {c[0] for c in candidates}:
+            tutor_candidates = [c for c in candidates if c[0] == tutor_id]
+            query = db.session.query(Booking.start_time, Booking.end_time).filter(
+                Booking.tutor_id == tutor_id,
+                Booking.status == "accepted"
+            )
+            window_start = min(c[1] for c in tutor_candidates)
+            window_end = max(c[2] for c in tutor_candidates)
+            accepted[tutor_id] = [
+                (r.start_time, r.end_time)
+                for r in queries.overlapping(query, window_start, window_end).order_by(Booking.start_time)
+            ]
+        
+        approved_ids, conflicting_ids = resolve_approvals(candidates, accepted)
+        by_id = {c[3]: c for c in candidates}
+        for booking_id in approved_ids:
+            tutor_id, start, end, _ = by_id[booking_id]
+            outcomes[booking_id] = "accepted"
+            changes[booking_id] = (tutor_id, "accepted", start, end)
+        for booking_id in conflicting_ids:
+            tutor_id, start, end, _ = by_id[booking_id]
+            outcomes[booking_id] = "denied_conflict"
+            changes[booking_id] = (tutor_id, "denied", start, end)
+        
+        # Other pending bookings overlapping an approved one are denied too
+        # (read under the lock from the database; see approve_booking)
+        auto_denied = {}
+        for booking_id in approved_ids:
+            tutor_id, start, end, _ = by_id[booking_id]
+            for other in queries.pending_overlaps(tutor_id, start, end):
+                if other.id not in changes and other.id not in requested:
+                    auto_denied[other.id] = tutor_id
+        
+        accepted_ids = [i for i, change in changes.items() if change[1] == "accepted"]
+        denied_ids = [i for i, change in changes.items() if change[1] == "denied"] + list(auto_denied)
+        analytics.change_status(db.session, accepted_ids, "pending", "accepted")
+        denied = set(analytics.change_status(db.session, denied_ids, "pending", "denied"))
+        return {booking_id: tutor_id for booking_id, tutor_id in auto_denied.items() if booking_id in denied}
+    
+    auto_denied = with_calendar_lock(db.session, tutor_ids, apply_actions)
+    
+    for booking_id, (tutor_id, status, start, end) in changes.items():
+        conflict_index.mark(tutor_id, booking_id, status, start, end)
+    for booking_id, tutor_id in auto_denied.items():
+        conflict_index.discard(tutor_id, [booking_id])
+    for tutor_id in {change[0] for change in changes.values()}:
+        booking_versions.bump(tutor_id)
+    
+    students = queries.booking_students(list(changes) + list(auto_denied))
+    for booking_id, (tutor_id, status, start, _) in changes.items():
+        student_id, _ = students[booking_id]
+        publish_booking_change(tutor_id, student_id, booking_id, status)
+        notify_booking(student_id, status, start)
+    for booking_id, tutor_id in auto_denied.items():
+        student_id, start = students[booking_id]
+        publish_booking_change(tutor_id, student_id, booking_id, "denied")
+        notify_booking(student_id, "denied", start)
+    
+    return len(auto_denied)
+
+@bp.route("/admin/bookings/<int:booking_id>/deny", methods=["POST"])
+@admin_required
+def deny_booking(booking_id):
+    """
+    Deny a pending booking request.
+    """
+    booking = Booking.query.get(booking_id)
+    
+    if not booking:
+        return jsonify({"success": False, "error": "Booking not found"}), 404
+    
+    if booking.status != "pending":
+        return jsonify({"success": False, "error": f"Booking is already {booking.status}"}), 400
+    
+    # Only deny it if it is still pending once we hold the calendar lock; a
+    # concurrent approve or cancel may have got there first
+    try:
+        changed = with_calendar_lock(db.session, [booking.tutor_id], lambda: analytics.change_status(
+            db.session, [booking_id], "pending", "denied"))
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "The calendar is busy, please try again"}), 503
+    
+    if not changed:
+        return jsonify({"success": False, "error": f"Booking is already {booking.status}"}), 409
+    
+    conflict_index.record(booking)
+    booking_versions.bump(booking.tutor_id)
+    publish_booking_change(booking.tutor_id, booking.student_id, booking.id, booking.status)
+    notify_booking(booking.student_id, booking.status, booking.start_time)
+    
+    return jsonify({
+        "success": True,
+        "message": "Booking denied successfully"
+    })
+
+@bp.route("/admin/signup-approvals")
+@admin_required
+def admin_signup_approvals():
+    pending_users = User.query.filter_by(status="pending").all()
+    return render_template("admin/signup-approvals.html", pending_users=pending_users)
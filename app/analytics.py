@@ -0,0 +1,198 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Rollup column counting bookings in each status
+STATUS_COLUMNS = {
+    "pending": "pending_count",
+    "accepted": "accepted_count",
+    "denied": "denied_count",
+    "cancelled": "cancelled_count",
+}
+
+COUNTER_COLUMNS = tuple(STATUS_COLUMNS.values()) + ("accepted_minutes", "accepted_revenue_eur")
+
+
+def _deltas_for(rows, old_status, new_status, deltas=None) -> dict:
+    """
+    Add the rollup changes for rows moving from old_status to new_status to
+    deltas: (day, tutor_id) -> {column: change}.
+    """
+    deltas = {} if deltas is None else deltas
+    for row in rows:
+        counters = deltas.setdefault((row.start_time.date(), row.tutor_id), dict.fromkeys(COUNTER_COLUMNS, 0))
+        for status, sign in ((old_status, -1), (new_status, 1)):
+            if status in STATUS_COLUMNS:
+                counters[STATUS_COLUMNS[status]] += sign
+            if status == "accepted":
+                counters["accepted_minutes"] += sign * row.lesson_minutes
+                counters["accepted_revenue_eur"] += sign * row.price_eur
+    return deltas
+
+
+def record_transitions(session, rows, old_status, new_status):
+    """
+    Update the daily rollups for bookings whose status changed. Call inside
+    the transaction that changes them, so the rollups commit (or roll back)
+    with the bookings.
+
+    Args:
+        session: Database session
+        rows: Bookings (or rows with tutor_id, start_time, lesson_minutes
+            and price_eur)
+        old_status: Status before, or None for new bookings
+        new_status: Status after
+    """
+    deltas = _deltas_for(rows, old_status, new_status)
+    if deltas:
+        _apply(session, deltas)
+
+
+def change_status(session, booking_ids, old_status: str, new_status: str) -> list:
+    """
+    Move bookings that are still in old_status to new_status with one UPDATE,
+    and update the rollups to match.
+
+    Returns:
+        IDs of the bookings that changed
+    """
+    from .models import Booking
+
+    if not booking_ids:
+        return []
+    rows = session.query(
+        Booking.id, Booking.tutor_id, Booking.start_time, Booking.lesson_minutes, Booking.price_eur
+    ).filter(Booking.id.in_(booking_ids), Booking.status == old_status).all()
+    if not rows:
+        return []
+
+    changed = [row.id for row in rows]
+    session.query(Booking).filter(
+        Booking.id.in_(changed), Booking.status == old_status
+    ).update({"status": new_status}, synchronize_session=False)
+    record_transitions(session, rows, old_status, new_status)
+    return changed
+
+
+def _apply(session, deltas: dict):
+    from .models import DailyBookingStats
+
+    table = DailyBookingStats.__table__
+    params = [
+        dict(counters, day=day, tutor_id=tutor_id)
+        for (day, tutor_id), counters in deltas.items()
+    ]
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        insert = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        stmt = insert.on_conflict_do_update(
+            index_elements=["day", "tutor_id"],
+            set_={column: table.c[column] + insert.excluded[column] for column in COUNTER_COLUMNS}
+        )
+        session.execute(stmt, params)
+        return
+
+    # Other databases: update, and insert the (day, tutor) rows that are new
+    for values in params:
+        result = session.execute(
+            table.update()
+            .where(table.c.day == values["day"], table.c.tutor_id == values["tutor_id"])
+            .values({column: table.c[column] + values[column] for column in COUNTER_COLUMNS})
+        )
+        if result.rowcount == 0:
+            session.execute(table.insert().values(values))
+
+
+def rebuild(session, start: date = None, end: date = None, batch_size: int = 1000) -> int:
+    """
+    Recompute the rollups for lessons on days in [start, end) (all days by
+    default) from the bookings themselves. Bookings are streamed batch_size
+    rows at a time; the caller commits.
+
+    Returns:
+        Number of (day, tutor) rows written
+    """
+    from .models import Booking, DailyBookingStats
+
+    query = session.query(
+        Booking.tutor_id, Booking.start_time, Booking.status, Booking.lesson_minutes, Booking.price_eur
+    )
+    stale = session.query(DailyBookingStats)
+    if start is not None:
+        query = query.filter(Booking.start_time >= datetime.combine(start, datetime.min.time()))
+        stale = stale.filter(DailyBookingStats.day >= start)
+    if end is not None:
+        query = query.filter(Booking.start_time < datetime.combine(end, datetime.min.time()))
+        stale = stale.filter(DailyBookingStats.day < end)
+
+    deltas = {}
+    for row in query.yield_per(batch_size):
+        _deltas_for([row], None, row.status, deltas)
+
+    stale.delete(synchronize_session=False)
+    if deltas:
+        session.execute(DailyBookingStats.__table__.insert(), [
+            dict(counters, day=day, tutor_id=tutor_id)
+            for (day, tutor_id), counters in deltas.items()
+        ])
+    return len(deltas)
+
+
+def daily(session, start: date, end: date, tutor_id: int = None) -> list:
+    """
+    Get per-day figures for [start, end), summed over tutors unless one is
+    given. Reads one rollup row per day and tutor.
+
+    Returns:
+        List of dicts with day, bookings, accepted, denied, cancelled,
+        pending, minutes, revenue_eur and approval_rate, one per day that
+        has any bookings
+    """
+    from .models import db, DailyBookingStats
+
+    stats = DailyBookingStats
+    query = session.query(
+        stats.day, *(db.func.sum(getattr(stats, column)).label(column) for column in COUNTER_COLUMNS)
+    ).filter(stats.day >= start, stats.day < end)
+    if tutor_id is not None:
+        query = query.filter(stats.tutor_id == tutor_id)
+    return [_figures(row, day=row.day.isoformat()) for row in query.group_by(stats.day).order_by(stats.day)]
+
+
+def summary(session, start: date, end: date, tutor_id: int = None) -> dict:
+    """
+    Get totals for [start, end) in the same shape as daily().
+    """
+    from .models import db, DailyBookingStats
+
+    stats = DailyBookingStats
+    query = session.query(
+        *(db.func.coalesce(db.func.sum(getattr(stats, column)), 0).label(column) for column in COUNTER_COLUMNS)
+    ).filter(stats.day >= start, stats.day < end)
+    if tutor_id is not None:
+        query = query.filter(stats.tutor_id == tutor_id)
+    return _figures(query.one(), start=start.isoformat(), end=end.isoformat())
+
+
+def _figures(row, **extra) -> dict:
+    decided = row.accepted_count + row.denied_count
+    return dict(
+        extra,
+        bookings=sum(getattr(row, column) for column in STATUS_COLUMNS.values()),
+        pending=row.pending_count,
+        accepted=row.accepted_count,
+        denied=row.denied_count,
+        cancelled=row.cancelled_count,
+        minutes=row.accepted_minutes,
+        revenue_eur=row.accepted_revenue_eur,
+        approval_rate=round(row.accepted_count / decided, 3) if decided else None,
+    )
+
+
+def default_range(today: date = None, days: int = 30) -> tuple:
+    """
+    The last `days` days up to and including today, as [start, end).
+    """
+    today = today or datetime.utcnow().date()
+    return today - timedelta(days=days - 1), today + timedelta(days=1)
@@ -0,0 +1,573 @@
+from flask import Blueprint, current_app, jsonify, request, url_for, stream_with_context
+from flask_login import login_required, current_user
+from datetime import date, datetime, timedelta
+from .models import db, User, Booking
+from .helpers import calculate_price, is_within_availability, parse_iso_datetime
+from .slots import free_windows_any, week_grid, combine_grids, GRID_CODES, DAY_START_HOUR, DAY_END_HOUR, SLOT_MINUTES
+from .cache import booking_versions, week_cache, grid_cache, feed_versions, feed_cache, cached_response
+from .availability import availability_cache
+from .events import broker, publish_booking_change, sse_stream, TooManySubscribers
+from .reservations import with_calendar_lock, ReservationBusy
+from .users import user_cache
+from .identity import current_identity
+from .conflicts import conflict_index
+from . import queries, assignment, series, analytics, feeds
+
+from functools import partial
+import json
+import uuid
+
+bp = Blueprint("api", __name__)
+
+@bp.route("/api/notifications")
+@login_required
+def notifications_api():
+    """
+    Get current user's notifications, newest first, one page at a time.
+    Query params: limit (default 20, max 100), cursor (next_cursor from the
+    previous page), unread=1 to skip read notifications.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        cursor = queries.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid limit or cursor"}), 400
+    
+    # Fetch one extra row to know whether another page exists
+    notifications = queries.user_notifications(
+        current_user.id, limit + 1, cursor=cursor,
+        unread_only=request.args.get('unread') == '1'
+    )
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = queries.encode_cursor(notifications[-1], "created_at")
+    
+    notifications_data = [{
+        "id": notification.id,
+        "message": notification.message,
+        "is_read": bool(notification.is_read),
+        "created_at": notification.created_at.isoformat()
+    } for notification in notifications]
+    
+    return jsonify({
+        "success": True,
+        "notifications": notifications_data,
+        "next_cursor": next_cursor,
+        "unread_count": current_user.unread_count
+    })
+
+@bp.route("/api/notifications/mark-read", methods=["POST"])
+@login_required
+def mark_notifications_read():
+    """
+    Mark notifications as read. Body: {"ids": [1, 2, ...]} or {"all": true}.
+    """
+    data = request.get_json(silent=True) or {}
+    if data.get("all"):
+        ids = None
+    else:
+        ids = data.get("ids")
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return jsonify({"success": False, "error": "Provide a list of notification ids or all=true"}), 400
+    
+    marked = queries.mark_notifications_read(current_user.id, ids)
+    db.session.commit()
+    user_cache.invalidate(current_user.id)
+    
+    unread_count = db.session.query(User.unread_count).filter(User.id == current_user.id).scalar()
+    return jsonify({"success": True, "marked": marked, "unread_count": unread_count})
+
+@bp.route("/api/book-slot", methods=["POST"])
+@login_required
+def book_slot():
+    """
+    Create a booking request for a student.
+    Requires: student must be logged in and approved.
+    """
+    if current_identity().role != "student" or current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    data = request.get_json()
+    if not data or not isinstance(data, dict):
+        return jsonify({"success": False, "error": "No data provided"}), 400
+    
+    start_time_str = data.get("start_time")
+    lesson_minutes = data.get("lesson_minutes")
+    
+    if not start_time_str or not lesson_minutes:
+        return jsonify({"success": False, "error": "Missing required fields"}), 400
+    
+    try:
+        start_time = parse_iso_datetime(start_time_str)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid date format"}), 400
+    
+    # Validate duration
+    if not isinstance(lesson_minutes, int) or lesson_minutes < 120 or lesson_minutes > 240:
+        return jsonify({"success": False, "error": "Duration must be between 2 and 4 hours"}), 400
+    
+    if lesson_minutes % 60 != 0:
+        return jsonify({"success": False, "error": "Duration must be in 1-hour increments"}), 400
+    
+    # Check if booking is in the future
+    if start_time < datetime.utcnow():
+        return jsonify({"success": False, "error": "Cannot book past time slots"}), 400
+    
+    # Calculate end time
+    end_time = start_time + timedelta(minutes=lesson_minutes)
+
+    # Calculate price
+    try:
+        price_eur = calculate_price(lesson_minutes)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    
+    # A specific tutor, or "any" (the default) to let the assignment engine pick
+    tutor_choice = data.get("tutor_id", "any")
+    try:
+        candidates = assignment.parse_tutor_choice(tutor_choice, db.session)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid tutor_id"}), 400
+    
+    if not candidates:
+        return jsonify({"success": False, "error": "No tutor available"}), 404
+    
+    # Tutors that are available with no accepted booking in the way (checked
+    # against the availability bitmaps and the in-memory conflict index)
+    ranked = assignment.rank_tutors(candidates, start_time, end_time,
+                                    current_app.config["TUTOR_ASSIGNMENT_POLICY"], db.session)
+    
+    if not ranked:
+        if tutor_choice == "any":
+            error = "No tutor is available at this time"
+        elif not is_within_availability(candidates[0], start_time, end_time, db.session):
+            error = "Tutor is not available at this time"
+        else:
+            error = "This time slot is already booked"
+        return jsonify({"success": False, "error": error}), 400
+    
+    student_id = current_user.id
+    
+    def reserve(tutor_id):
+        # Authoritative check and insert under the calendar lock, so an
+        # approval can't slip in between them
+        if queries.accepted_conflict(tutor_id, start_time, end_time):
+            return None
+        
+        # Create booking
+        booking = Booking(
+            student_id=student_id,
+            tutor_id=tutor_id,
+            start_time=start_time,
+            end_time=end_time,
+            lesson_minutes=lesson_minutes,
+            price_eur=price_eur,
+            status="pending"
+        )
+        db.session.add(booking)
+        analytics.record_transitions(db.session, [booking], None, "pending")
+        return booking
+    
+    # Lock only the chosen tutor's calendar; if someone else got the slot
+    # first, fall back to the next best tutor
+    new_booking = None
+    for tutor_id in ranked[:assignment.MAX_ATTEMPTS]:
+        try:
+            new_booking = with_calendar_lock(db.session, [tutor_id], partial(reserve, tutor_id))
+        except ReservationBusy:
+            return jsonify({"success": False, "error": "Too many booking requests right now, please try again"}), 503
+        if new_booking is not None:
+            break
+    
+    if new_booking is None:
+        return jsonify({"success": False, "error": "This time slot is already booked"}), 400
+    
+    conflict_index.record(new_booking)
+    booking_versions.bump(new_booking.tutor_id)
+    publish_booking_change(new_booking.tutor_id, new_booking.student_id, new_booking.id, new_booking.status)
+    
+    return jsonify({
+        "success": True,
+        "booking_id": new_booking.id,
+        "tutor_id": new_booking.tutor_id,
+        "message": "Booking request submitted successfully"
+    }), 201
+
+@bp.route("/api/book-series", methods=["POST"])
+@login_required
+def book_series():
+    """
+    Request the same weekly lesson for several weeks in one go.
+    Body: start_time (first lesson), lesson_minutes, weeks (number of lessons)
+    or until (last date), interval_weeks (default 1), tutor_id (default "any"),
+    skip_conflicts (book the free weeks if some are taken; default false).
+    All lessons are checked with one range query and inserted in one
+    transaction, linked by a series_id.
+    """
+    if current_identity().role != "student" or current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({"success": False, "error": "No data provided"}), 400
+    
+    lesson_minutes = data.get("lesson_minutes")
+    try:
+        start_time = parse_iso_datetime(data["start_time"])
+        weeks = int(data["weeks"]) if data.get("weeks") is not None else None
+        until = date.fromisoformat(data["until"][:10]) if data.get("until") else None
+        interval_weeks = int(data.get("interval_weeks", 1))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid start_time, weeks, until or interval_weeks"}), 400
+    
+    if weeks is None and until is None:
+        return jsonify({"success": False, "error": "Give weeks or until"}), 400
+    
+    if not isinstance(lesson_minutes, int) or lesson_minutes < 120 or lesson_minutes > 240 or lesson_minutes % 60 != 0:
+        return jsonify({"success": False, "error": "Duration must be 2 to 4 hours in 1-hour increments"}), 400
+    
+    if start_time < datetime.utcnow():
+        return jsonify({"success": False, "error": "Cannot book past time slots"}), 400
+    
+    if weeks is not None and not 2 <= weeks <= series.MAX_SERIES_LENGTH:
+        return jsonify({"success": False, "error": f"A series has 2 to {series.MAX_SERIES_LENGTH} lessons"}), 400
+    
+    if not 1 <= interval_weeks <= 4:
+        return jsonify({"success": False, "error": "interval_weeks must be 1 to 4"}), 400
+    
+    times = series.series_times(start_time, lesson_minutes, weeks, until, interval_weeks)
+    if len(times) < 2:
+        return jsonify({"success": False, "error": "A series needs at least 2 lessons"}), 400
+    
+    price_eur = calculate_price(lesson_minutes)
+    skip_conflicts = bool(data.get("skip_conflicts"))
+    
+    tutor_choice = data.get("tutor_id", "any")
+    try:
+        candidates = assignment.parse_tutor_choice(tutor_choice, db.session)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid tutor_id"}), 400
+    
+    if not candidates:
+        return jsonify({"success": False, "error": "No tutor available"}), 404
+    
+    # Tutors free for the first lesson, best first; then the first one free
+    # for every lesson (or with the fewest clashes when skipping)
+    ranked = assignment.rank_tutors(candidates, times[0][0], times[0][1],
+                                    current_app.config["TUTOR_ASSIGNMENT_POLICY"], db.session) or candidates
+    best = None
+    for tutor_id in ranked[:assignment.MAX_ATTEMPTS]:
+        conflicts = series.series_conflicts(tutor_id, times, db.session)
+        if best is None or len(conflicts) < len(best[1]):
+            best = (tutor_id, conflicts)
+        if not conflicts:
+            break
+    tutor_id, conflicts = best
+    
+    if conflicts and not skip_conflicts:
+        return jsonify({
+            "success": False,
+            "error": "Some lessons in the series are not available",
+            "conflicts": [times[i][0].isoformat() for i in sorted(conflicts)]
+        }), 409
+    
+    series_id = uuid.uuid4().hex
+    student_id = current_user.id
+    
+    def reserve():
+        # Authoritative check under the calendar lock, then one executemany
+        taken = series.series_conflicts(tutor_id, times, db.session)
+        if taken and not skip_conflicts:
+            return None
+        rows = [{
+            "student_id": student_id,
+            "tutor_id": tutor_id,
+            "start_time": start,
+            "end_time": end,
+            "lesson_minutes": lesson_minutes,
+            "price_eur": price_eur,
+            "status": "pending",
+            "series_id": series_id
+        } for i, (start, end) in enumerate(times) if i not in taken]
+        if not rows:
+            return None
+        db.session.execute(db.insert(Booking), rows)
+        created = db.session.query(
+            Booking.id, Booking.tutor_id, Booking.start_time, Booking.end_time,
+            Booking.lesson_minutes, Booking.price_eur
+        ).filter(Booking.series_id == series_id).order_by(Booking.start_time).all()
+        analytics.record_transitions(db.session, created, None, "pending")
+        return created
+    
+    try:
+        created = with_calendar_lock(db.session, [tutor_id], reserve)
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "Too many booking requests right now, please try again"}), 503
+    
+    if not created:
+        return jsonify({"success": False, "error": "The lessons were booked by someone else, please try again"}), 409
+    
+    for row in created:
+        conflict_index.mark(tutor_id, row.id, "pending", row.start_time, row.end_time)
+    booking_versions.bump(tutor_id)
+    publish_booking_change(tutor_id, student_id, created[0].id, "pending")
+    
+    booked = {row.start_time for row in created}
+    return jsonify({
+        "success": True,
+        "series_id": series_id,
+        "tutor_id": tutor_id,
+        "booking_ids": [row.id for row in created],
+        "skipped": [start.isoformat() for start, _ in times if start not in booked],
+        "message": f"{len(created)} lesson requests submitted successfully"
+    }), 201
+
+@bp.route("/api/calendar/bookings", methods=["GET"])
+@login_required
+def get_calendar_bookings():
+    """
+    Get bookings for the calendar view.
+    Returns pending/accepted bookings overlapping the requested week.
+    Payloads are cached per (week, viewer role) until a booking changes and
+    carry an ETag, so re-visiting a week answers 304 Not Modified.
+    """
+    # Get week start from query params or use current week
+    week_start_str = request.args.get('week_start')
+    if week_start_str:
+        try:
+            week_start = parse_iso_datetime(week_start_str)
+        except ValueError:
+            week_start = datetime.utcnow()
+    else:
+        week_start = datetime.utcnow()
+    
+    # Calculate week end (7 days later)
+    week_end = week_start + timedelta(days=7)
+    
+    is_admin = current_identity().role == "admin"
+    cache_key = (week_start, "admin" if is_admin else "student")
+    version = booking_versions.total
+    entry = week_cache.get(cache_key, version)
+    
+    if entry is None:
+        with queries.read_session() as session:
+            bookings = queries.active_bookings_overlapping(week_start, week_end, session)
+        
+        # Format bookings for frontend (only admins see who booked)
+        bookings_data = []
+        for booking in bookings:
+            data = {
+                'id': booking.id,
+                'start_time': booking.start_time.isoformat(),
+                'end_time': booking.end_time.isoformat(),
+                'status': booking.status,
+                'tutor_id': booking.tutor_id
+            }
+            if is_admin:
+                data['student_id'] = booking.student_id
+            bookings_data.append(data)
+        
+        body = json.dumps({'success': True, 'bookings': bookings_data}).encode()
+        entry = week_cache.put(cache_key, version, body)
+    
+    return cached_response(current_app.response_class, entry, request)
+
+@bp.route("/api/events")
+@login_required
+def event_stream():
+    """
+    Server-sent events stream of booking changes. Everyone hears about
+    changes to the tutors' calendars; students also hear about their own
+    bookings. Clients re-fetch the affected view when an event arrives.
+    Each open stream holds a server thread (or greenlet), so at most
+    EVENT_STREAM_MAX_SUBSCRIBERS are served per process; past that clients
+    get 503 and the pages work without live updates.
+    """
+    tutor_ids = assignment.tutor_ids(db.session)
+    channels = [f"tutor:{tutor_id}" for tutor_id in tutor_ids]
+    if current_identity().role != "admin":
+        channels.append(f"student:{current_user.id}")
+    
+    # Release the DB connection; the stream may stay open for hours
+    db.session.remove()
+    
+    try:
+        subscription = broker.subscribe(channels, limit=current_app.config["EVENT_STREAM_MAX_SUBSCRIBERS"])
+    except TooManySubscribers:
+        return jsonify({"success": False, "error": "Too many live connections, please try again later"}), 503, {"Retry-After": "60"}
+    response = current_app.response_class(stream_with_context(sse_stream(subscription)), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+@bp.route("/api/calendar/feed")
+@login_required
+def calendar_feed_url():
+    """
+    Get the current user's iCalendar subscription URL: their lessons for
+    students, their teaching schedule for tutors.
+    """
+    identity = current_identity()
+    if identity.status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    token = feeds.feed_token(current_app.config["SECRET_KEY"], current_user.id, identity.role == "admin")
+    return jsonify({"success": True, "url": url_for("api.calendar_feed", token=token, _external=True)})
+
+@bp.route("/calendar/<token>.ics")
+def calendar_feed(token):
+    """
+    iCalendar feed for calendar apps, authenticated by the signed token in
+    the URL. Rendered feeds are cached per user until one of their bookings
+    changes, and carry an ETag and Last-Modified, so most polls are answered
+    304 Not Modified without touching the database.
+    """
+    try:
+        user_id, is_tutor = feeds.read_token(current_app.config["SECRET_KEY"], token)
+    except ValueError:
+        return "Not found", 404
+    
+    cache_key = (user_id, is_tutor)
+    version = feed_versions.get(user_id)
+    entry = feed_cache.get(cache_key, version)
+    
+    if entry is None:
+        with queries.read_session() as session:
+            user = session.get(User, user_id)
+            if user is None or user.status != "approved" or (user.role == "admin") != is_tutor:
+                return "Not found", 404
+            body = feeds.render(session, user_id, is_tutor, request.host.split(":")[0])
+        entry = feed_cache.put(cache_key, version, body)
+    
+    response = current_app.response_class(entry.body, mimetype="text/calendar")
+    response.set_etag(entry.etag)
+    response.last_modified = entry.modified
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+@bp.route("/api/calendar/grid", methods=["GET"])
+@login_required
+def get_calendar_grid():
+    """
+    Get the precomputed status of every 15-minute slot of a week between
+    DAY_START_HOUR and DAY_END_HOUR, as one string per day (see "legend").
+    Query params: week_start, tutor_id (default "any": a slot shows the most
+    bookable status of any tutor).
+    Cached per week until a booking or a tutor's availability changes, or
+    another slot becomes past.
+    """
+    week_start_str = request.args.get('week_start')
+    try:
+        week_start = parse_iso_datetime(week_start_str) if week_start_str else datetime.utcnow()
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid week_start"}), 400
+    
+    try:
+        tutor_ids = assignment.parse_tutor_choice(request.args.get('tutor_id'), db.session)
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid tutor_id"}), 400
+    
+    if not tutor_ids:
+        return jsonify({"success": False, "error": "No tutor available"}), 404
+    
+    now = datetime.utcnow()
+    weeklies = {tutor_id: availability_cache.get(tutor_id, db.session) for tutor_id in tutor_ids}
+    
+    # Number of slot boundaries already passed; the grid only changes when it does
+    elapsed = (now - week_start) / timedelta(minutes=SLOT_MINUTES)
+    past_key = min(max(int(-(-elapsed // 1)), 0), 7 * 24 * 60 // SLOT_MINUTES)
+    
+    cache_key = (week_start, tuple(tutor_ids), past_key)
+    version = tuple((booking_versions.get(tutor_id), weeklies[tutor_id].generation) for tutor_id in tutor_ids)
+    entry = grid_cache.get(cache_key, version)
+    
+    if entry is None:
+        week_end = week_start + timedelta(days=7)
+        # One index range scan per tutor (ix_booking_tutor_status_start)
+        grids = []
+        for tutor_id in tutor_ids:
+            query = db.session.query(Booking.start_time, Booking.end_time, Booking.status).filter(
+                Booking.tutor_id == tutor_id,
+                Booking.status.in_(queries.ACTIVE_STATUSES)
+            )
+            bookings = queries.overlapping(query, week_start, week_end).order_by(Booking.start_time).all()
+            grids.append(week_grid(weeklies[tutor_id], bookings, week_start, now))
+        
+        body = json.dumps({
+            'success': True,
+            'week_start': week_start.isoformat(),
+            'day_start_hour': DAY_START_HOUR,
+            'day_end_hour': DAY_END_HOUR,
+            'slot_minutes': SLOT_MINUTES,
+            'legend': GRID_CODES,
+            'tutor_ids': tutor_ids,
+            'days': grids[0] if len(grids) == 1 else combine_grids(grids)
+        }).encode()
+        entry = grid_cache.put(cache_key, version, body)
+    
+    return cached_response(current_app.response_class, entry, request)
+
+@bp.route("/api/slots/free", methods=["GET"])
+@login_required
+def free_slots_api():
+    """
+    Get open booking windows for a date range.
+    Query params: from, to (ISO datetimes), minutes (lesson length, default 120),
+    limit (max windows returned, default 100), tutor_id (default "any": every
+    tutor's windows, merged by start time then tutor). When more windows
+    exist the response includes next_cursor; pass it back as cursor (with
+    the same to/minutes/tutor_id) for the next page.
+    """
+    now = datetime.utcnow()
+    try:
+        range_start = parse_iso_datetime(request.args['from']) if request.args.get('from') else now
+        range_end = parse_iso_datetime(request.args['to']) if request.args.get('to') else range_start + timedelta(days=7)
+        minutes = int(request.args.get('minutes', 120))
+        limit = max(1, min(int(request.args.get('limit', 100)), 500))
+        cursor = None
+        if request.args.get('cursor'):
+            # "<start>,<tutor_id>" of the first window not yet returned
+            cursor_start, _, cursor_tutor = request.args['cursor'].rpartition(',')
+            cursor = (parse_iso_datetime(cursor_start), int(cursor_tutor))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid parameters"}), 400
+    
+    if minutes < 120 or minutes > 240 or minutes % 60 != 0:
+        return jsonify({"success": False, "error": "Duration must be 2 to 4 hours in 1-hour increments"}), 400
+    
+    if range_end - range_start > timedelta(days=366):
+        return jsonify({"success": False, "error": "Range cannot exceed one year"}), 400
+    
+    try:
+        tutor_ids = assignment.parse_tutor_choice(request.args.get('tutor_id'), db.session)
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid tutor_id"}), 400
+    
+    if not tutor_ids:
+        return jsonify({"success": False, "error": "No tutor available"}), 404
+    
+    if cursor is not None:
+        # Windows never cross midnight (calendar hours end at DAY_END_HOUR),
+        # so restarting at the cursor's midnight yields each one unclipped;
+        # the ones before the cursor were on earlier pages and are skipped
+        range_start = datetime.combine(cursor[0].date(), datetime.min.time())
+    
+    # Past time slots can't be booked
+    range_start = max(range_start, now)
+    
+    slots = []
+    next_cursor = None
+    for start, end, tutor_id in free_windows_any(tutor_ids, range_start, range_end, minutes, db.session):
+        if cursor is not None and (start, tutor_id) < cursor:
+            continue
+        if len(slots) == limit:
+            next_cursor = f"{start.isoformat()},{tutor_id}"
+            break
+        slots.append({'start_time': start.isoformat(), 'end_time': end.isoformat(), 'tutor_id': tutor_id})
+    
+    return jsonify({
+        'success': True,
+        'slots': slots,
+        'next_cursor': next_cursor
+    })
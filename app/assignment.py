@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from .availability import availability_cache
+from .conflicts import conflict_index
+
+# How book_slot picks a tutor when the student asks for any tutor:
+#   least_loaded  - fewest pending/accepted bookings still to come
+#   earliest_free - the tutor who has been free the longest before the slot
+POLICIES = ("least_loaded", "earliest_free")
+
+# Tutors tried in turn when the chosen one's slot is taken before it locks
+MAX_ATTEMPTS = 3
+
+
+def tutor_ids(db_session) -> list:
+    """
+    Get the IDs of every tutor, in a stable order.
+    """
+    from .models import User
+
+    return [row.id for row in db_session.query(User.id).filter(User.role == "admin").order_by(User.id)]
+
+
+def parse_tutor_choice(value, db_session):
+    """
+    Turn a tutor_id request value into the tutors to consider.
+
+    Args:
+        value: A tutor ID, "any", or None (same as "any")
+        db_session: Database session object
+
+    Returns:
+        List of tutor IDs (empty if the given tutor doesn't exist)
+
+    Raises:
+        ValueError: If value is not an ID or "any"
+    """
+    tutors = tutor_ids(db_session)
+    if value is None or value == "any":
+        return tutors
+    tutor_id = int(value)
+    return [tutor_id] if tutor_id in tutors else []
+
+
+def rank_tutors(candidates, start: datetime, end: datetime, policy: str, db_session) -> list:
+    """
+    Order the tutors who can take [start, end), best first.
+
+    Each check runs against one tutor's own data: the compiled availability
+    bitmaps and that tutor's partition of the conflict index, so the cost per
+    tutor doesn't grow with the number of tutors. The index may be stale, so
+    the caller re-checks the chosen tutor in SQL under the calendar lock.
+
+    Args:
+        candidates: Tutor IDs to consider
+        start: Booking start time
+        end: Booking end time
+        policy: One of POLICIES
+        db_session: Database session object
+
+    Returns:
+        IDs of tutors who are available and have no accepted booking in the
+        way, best first
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown assignment policy: {policy}")
+
+    ranked = []
+    for tutor_id in candidates:
+        if not availability_cache.get(tutor_id, db_session).contains(start, end):
+            continue
+        if conflict_index.accepted_conflict(tutor_id, start, end):
+            continue
+        load, free_since = conflict_index.workload(tutor_id, start)
+        free_since = free_since or datetime.min
+        if policy == "least_loaded":
+            key = (load, free_since, tutor_id)
+        else:
+            key = (free_since, load, tutor_id)
+        ranked.append((key, tutor_id))
+    ranked.sort()
+    return [tutor_id for _, tutor_id in ranked]
@@ -0,0 +1,179 @@
+from flask import Blueprint, jsonify, request, render_template, session, redirect, flash
+from flask_login import login_user, logout_user, login_required, current_user
+from .models import db, User
+from .helpers import parse_email_input
+from .passwords import hasher, HasherBusy
+from .identity import issue as issue_identity
+from .ratelimit import login_ip_limiter, login_account_limiter
+from . import queries
+
+bp = Blueprint("auth", __name__)
+
+# The homepage route which dispalys the calendar
+@bp.route("/")
+def index():
+    return render_template("index.html")
+
+@bp.route("/availability")
+def availability():
+    return render_template("availability.html")
+
+# The route to handle date selection
+@bp.route("/select_date", methods=["POST"])
+def select_date():
+    data = request.get_json() # Get JSON data from the request
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
+    # Extract date information from the received data
+    time = data.get("time")
+    day = data.get("day")
+    month = data.get("month")
+    year = data.get("year")
+    selected_date = data.get("selected_date")
+    print(f"Date selected: {selected_date} (Time: {time}, Day: {day}, Month: {month}, Year: {year})")
+    # Return a success response
+    return jsonify({"status": "success", "selected_date": selected_date,
+                    "time": time, "day": day, "month": month, "year": year})
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    # If user is already logged in, redirect to their dashboard
+    if current_user.is_authenticated:
+        if current_user.role == "admin":
+            return redirect("/admin/dashboard")
+        else:
+            return redirect("/student/dashboard")
+
+    if request.method == "POST":
+        # The per-IP limit is checked before any lookup, the per-account one
+        # before any hashing work
+        retry_after = login_ip_limiter.hit(request.remote_addr)
+        if retry_after:
+            flash("Too many login attempts. Please try again later.", "error")
+            return render_template("login.html"), 429, {"Retry-After": str(int(retry_after) + 1)}
+
+        raw_email = request.form.get("email")
+        password = request.form.get("password")
+
+        if not raw_email or not password:
+            flash("You must complete all fields.", "error")
+            return render_template("login.html"), 400
+
+        try:
+            user = queries.user_for_login(raw_email)
+        except ValueError as e:
+            flash(str(e), "error")
+            return render_template("login.html"), 400
+
+        # Keyed on the user the entry resolves to, so spelling the same
+        # account differently ("stud@a1.com", "stud@a2.com") shares a bucket
+        account = user.id if user else raw_email.strip().lower()
+        retry_after = login_account_limiter.hit(account)
+        if retry_after:
+            flash("Too many login attempts for this account. Please try again later.", "error")
+            return render_template("login.html"), 429, {"Retry-After": str(int(retry_after) + 1)}
+
+        try:
+            matches, new_hash = hasher.verify(user.password_hash, password) if user else (False, None)
+        except HasherBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("login.html"), 503
+
+        if not matches:
+            flash("Invalid email/username or password", "error")
+            return render_template("login.html"), 403
+
+        login_account_limiter.reset(account)
+
+        # Stored hash uses an outdated method; upgrade it now we know the password
+        if new_hash:
+            user.password_hash = new_hash
+            db.session.commit()
+
+        # Check if student is approved
+        if user.role == "student" and user.status != "approved":
+            flash("Your account is pending approval. Please wait for admin approval.", "error")
+            return render_template("login.html")
+
+        # Log the user in using Flask-Login
+        login_user(user)
+        issue_identity(user)
+        
+        if user.role == "admin":
+            return redirect("/admin/dashboard")
+        else:
+            return redirect("/student/dashboard")
+
+    return render_template("login.html")
+
+@bp.route("/signup", methods=["GET", "POST"])
+def signup():
+    # If user is already logged in, redirect to their dashboard
+    if current_user.is_authenticated:
+        if current_user.role == "admin":
+            return redirect("/admin/dashboard")
+        else:
+            return redirect("/student/dashboard")
+    
+    if request.method == "POST":
+        # ... rest of signup logic
+        name = request.form.get("name")
+        lastname = request.form.get("lastname")
+        username = request.form.get("username")
+        raw_email = request.form.get("email")
+        password = request.form.get("password")
+        repeat_password = request.form.get("repeat_password")
+
+        if not all([name, lastname, username, raw_email, password, repeat_password]):
+            flash("All fields are required", "error")
+            return render_template("signup.html"), 400
+
+        try:
+            parsed_username, email = parse_email_input(raw_email)
+        except ValueError as e:
+            flash(str(e), "error")
+            return render_template("signup.html"), 400
+
+        if password != repeat_password:
+            flash("Passwords do not match", "error")
+            return render_template("signup.html"), 400
+
+        existing_email = User.query.filter_by(email=email).first()
+        if existing_email is not None:
+            flash("That email is already registered", "error")
+            return render_template("signup.html"), 400
+
+        existing_username = User.query.filter(db.func.lower(User.username) == username.lower()).first()
+        if existing_username is not None:
+            flash("That username is already taken", "error")
+            return render_template("signup.html"), 400
+
+        try:
+            hashed = hasher.hash(password)
+        except HasherBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("signup.html"), 503
+
+        new_user = User(
+            username=username,
+            email=email,
+            password_hash=hashed,
+            role="student",
+            status="pending"
+        )
+
+        db.session.add(new_user)
+        db.session.commit()
+
+        flash("Sign up request submitted! Check your email for an approval notification", "success")
+        return redirect("/")
+
+    return render_template("signup.html")
+
+@bp.route("/logout")
+@login_required
+def logout():
+    logout_user()
+    session.pop("identity", None)
+    flash("You have been logged out.", "info")
+    return redirect("/")
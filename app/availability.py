@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .recurrence import parse_rule, occurrences
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES  # 96
+
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+# Months of expanded masks kept per tutor
+MONTHS_CACHED = 24
+
+logger = logging.getLogger(__name__)
+
+
+def slot_mask(start_minute: int, end_minute: int) -> int:
+    """
+    Bitmask of the 15-minute slots needed to cover [start_minute, end_minute).
+    """
+    first = start_minute // SLOT_MINUTES
+    last = -(-end_minute // SLOT_MINUTES)  # ceil
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def block_mask(start_minute: int, end_minute: int) -> int:
+    """
+    Bitmask of the 15-minute slots fully inside [start_minute, end_minute).
+    """
+    first = -(-start_minute // SLOT_MINUTES)
+    last = end_minute // SLOT_MINUTES
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def _minutes(t) -> int:
+    return t.hour * 60 + t.minute
+
+
+class TutorAvailability:
+    """
+    A tutor's availability rules, expanded into one 96-bit slot mask per date.
+
+    Each Availability row's repeat_rule is parsed once (see recurrence.py).
+    Dates are expanded a month at a time, on first use, by walking each
+    rule's occurrences in that month and clearing the tutor's blocked dates;
+    the last MONTHS_CACHED months are kept. A rule that doesn't parse adds
+    no time; a tutor whose rules all fail is unavailable, not open all day.
+    """
+
+    def __init__(self, blocks, blocked=()):
+        self.generation = 0
+        # No availability set = tutor is available all day (for now)
+        self.empty = not blocks and not blocked
+        # Only blocked dates: available all day apart from those
+        self.open_all_day = not blocks
+        self.rules = []
+        for block in blocks:
+            start = _minutes(block.start_time)
+            end = _minutes(block.end_time) or 24 * 60  # 00:00 end means midnight
+            try:
+                rule = parse_rule(block.repeat_rule)
+            except ValueError:
+                logger.warning("Skipping availability %s with bad repeat_rule %r",
+                               block.id, block.repeat_rule)
+                continue
+            if rule.count is not None and block.starts_on is None:
+                # Written before COUNT needed starts_on; counting from
+                # DEFAULT_ANCHOR would end it at some arbitrary past date
+                logger.warning("Skipping availability %s: COUNT rule %r without starts_on",
+                               block.id, block.repeat_rule)
+                continue
+            if block.repeat_until is not None:
+                until = block.repeat_until.date()
+                rule.until = until if rule.until is None else min(rule.until, until)
+            if block.starts_on is None and rule.freq != "DAILY" and not rule.by_day and not rule.by_month_day:
+                # Plain "weekly"/"monthly" with nothing to anchor it used to
+                # mean every day; keep it that way
+                rule.freq = "DAILY"
+            self.rules.append((rule, block.starts_on, block_mask(start, end)))
+
+        self.blocked = {}  # date -> mask of blocked slots
+        for row in blocked:
+            if row.start_time is None:
+                mask = FULL_DAY
+            else:
+                mask = slot_mask(_minutes(row.start_time), _minutes(row.end_time) or 24 * 60)
+            self.blocked[row.date] = self.blocked.get(row.date, 0) | mask
+
+        self._months = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _month(self, year: int, month: int) -> list:
+        key = (year, month)
+        with self._lock:
+            masks = self._months.get(key)
+            if masks is not None:
+                self._months.move_to_end(key)
+                return masks
+
+        first = date(year, month, 1)
+        length = monthrange(year, month)[1]
+        end = first + timedelta(days=length)
+        masks = [FULL_DAY if self.open_all_day else 0] * length
+        for rule, anchor, mask in self.rules:
+            for day in occurrences(rule, first, end, anchor):
+                masks[day.day - 1] |= mask
+        for day, mask in self.blocked.items():
+            if first <= day < end:
+                masks[day.day - 1] &= ~mask
+
+        with self._lock:
+            self._months[key] = masks
+            while len(self._months) > MONTHS_CACHED:
+                self._months.popitem(last=False)
+        return masks
+
+    def day_mask(self, day) -> int:
+        return self._month(day.year, day.month)[day.day - 1]
+
+    def intervals(self, date) -> list:
+        """
+        Get the available (start_minute, end_minute) runs for a date.
+        """
+        if self.empty:
+            return [(0, 24 * 60)]
+
+        mask = self.day_mask(date)
+        runs = []
+        slot = 0
+        while mask:
+            # Skip unset slots, then measure the run of set ones
+            skip = (mask & -mask).bit_length() - 1
+            mask >>= skip
+            slot += skip
+            length = (~mask & (mask + 1)).bit_length() - 1
+            runs.append((slot * SLOT_MINUTES, (slot + length) * SLOT_MINUTES))
+            mask >>= length
+            slot += length
+        return runs
+
+    def contains(self, start: datetime, end: datetime) -> bool:
+        """
+        Check if [start, end) lies within availability, day by day.
+        """
+        if self.empty:
+            return True
+
+        day_start = datetime.combine(start.date(), datetime.min.time())
+        while day_start < end:
+            day_end = day_start + timedelta(days=1)
+            from_minute = int((max(start, day_start) - day_start).total_seconds() // 60)
+            to_minute = int((min(end, day_end) - day_start).total_seconds() // 60)
+            needed = slot_mask(from_minute, to_minute)
+            if self.day_mask(day_start.date()) & needed != needed:
+                return False
+            day_start = day_end
+        return True
+
+
+class AvailabilityCache:
+    """
+    Compiled TutorAvailability per tutor. Entries are dropped when
+    Availability or BlockedDate rows for the tutor are committed, and after
+    max_age so other worker processes pick up changes too.
+    """
+
+    def __init__(self, max_age: float = 300.0):
+        self.max_age = max_age
+        self._tutors = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, tutor_id: int, db_session) -> TutorAvailability:
+        from .models import Availability, BlockedDate
+
+        with self._lock:
+            cached = self._tutors.get(tutor_id)
+        if cached is not None and time.monotonic() - cached[0] <= self.max_age:
+            return cached[1]
+
+        blocks = db_session.query(Availability).filter_by(user_id=tutor_id).all()
+        blocked = db_session.query(BlockedDate).filter_by(user_id=tutor_id).all()
+        compiled = TutorAvailability(blocks, blocked)
+        with self._lock:
+            # Lets payload caches notice that availability was recompiled
+            self._generation += 1
+            compiled.generation = self._generation
+            self._tutors[tutor_id] = (time.monotonic(), compiled)
+        return compiled
+
+    def invalidate(self, tutor_id: int = None):
+        with self._lock:
+            if tutor_id is None:
+                self._tutors.clear()
+            else:
+                self._tutors.pop(tutor_id, None)
+
+
+availability_cache = AvailabilityCache()
+
+
+def register_invalidation(*models):
+    """
+    Drop cached availability for tutors whose rows in the given models
+    (Availability, BlockedDate; anything with a user_id) were written, once
+    the transaction commits.
+    """
+
+    def remember_tutor(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("availability_tutors", set()).add(target.user_id)
+
+    for model in models:
+        for event_name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, event_name, remember_tutor)
+
+    @event.listens_for(Session, "after_commit")
+    def invalidate_committed(session):
+        for tutor_id in session.info.pop("availability_tutors", ()):
+            availability_cache.invalidate(tutor_id)
+
+    @event.listens_for(Session, "after_rollback")
+    def forget_rolled_back(session):
+        session.info.pop("availability_tutors", None)
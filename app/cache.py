@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VersionCounter:
+    """
+    Per-key change counters (e.g. one per tutor). `total` moves whenever any
+    key is bumped, for payloads that cover every key.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, key):
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self.total += 1
+
+
+class CachedPayload:
+    def __init__(self, version, body: bytes):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.created = time.monotonic()
+        self.modified = time.time()  # for Last-Modified
+
+
+class PayloadCache:
+    """
+    LRU cache of serialized response bodies tagged with the version they were
+    built from. An entry is only returned while its version is current and it
+    is younger than max_age (other worker processes keep their own counters,
+    so max_age bounds how stale a payload can get).
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: float = 30.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or time.monotonic() - entry.created > self.max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body: bytes) -> CachedPayload:
+        entry = CachedPayload(version, body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Bumped by every route that creates a booking or changes its status
+booking_versions = VersionCounter()
+
+# Serialized /api/calendar/bookings payloads keyed by (week_start, role)
+week_cache = PayloadCache()
+
+# Serialized /api/calendar/grid payloads keyed by (week_start, tutor, past slots)
+grid_cache = PayloadCache()
+
+
+# Bumped per user (tutor and student) by events.publish_booking_change
+feed_versions = VersionCounter()
+
+# Rendered /calendar/<token>.ics feeds keyed by (user, is_tutor). Calendar
+# apps poll every few minutes, so entries live longer than the JSON caches.
+feed_cache = PayloadCache(max_entries=4096, max_age=600.0)
+
+
+def cached_response(response_class, entry: CachedPayload, request):
+    """
+    Build a JSON response from a cached payload, answering 304 Not Modified
+    when the client already has it.
+    """
+    response = response_class(entry.body, mimetype="application/json")
+    response.set_etag(entry.etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
@@ -0,0 +1,59 @@
+import os
+
+import click
+from flask.cli import with_appcontext
+
+from .models import db
+from . import analytics, export
+
+
+@click.command("backfill-analytics")
+@with_appcontext
+@click.option("--from", "start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First lesson day to rebuild")
+@click.option("--to", "end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Day after the last one to rebuild")
+def backfill_analytics(start, end):
+    """Rebuild the daily booking rollups from existing bookings."""
+    written = analytics.rebuild(db.session, start.date() if start else None, end.date() if end else None)
+    db.session.commit()
+    click.echo(f"Wrote {written} daily rollup rows")
+
+
+@click.command("export-bookings")
+@with_appcontext
+@click.option("--format", "file_format", type=click.Choice(list(export.FORMATS)), default="csv")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), required=True)
+@click.option("--from", "start", type=click.DateTime(formats=["%Y-%m-%d"]), help="Lessons starting on or after this day")
+@click.option("--to", "end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Lessons starting before this day")
+@click.option("--tutor", "tutor_id", type=int)
+@click.option("--status", "statuses", multiple=True, help="Repeat for several statuses")
+@click.option("--after-id", type=int, help="Resume after this booking id (CSV output is appended to)")
+def export_bookings(file_format, output, start, end, tutor_id, statuses, after_id):
+    """Export bookings with their tutor and student, streaming in chunks."""
+    if file_format not in export.available_formats():
+        raise click.ClickException(f"{file_format} export needs pyarrow installed")
+    
+    progress = {"last_id": after_id}
+    chunks = export.track_progress(
+        export.booking_chunks(db.session, start, end, tutor_id, list(statuses), after_id), progress
+    )
+    appending = file_format == "csv" and after_id is not None and os.path.exists(output)
+    parts = export.write(chunks, file_format)
+    if appending:
+        next(parts)  # header is already in the file
+    
+    try:
+        with open(output, ("a" if appending else "w") + ("" if file_format == "csv" else "b"),
+                  **({"newline": ""} if file_format == "csv" else {})) as f:
+            for part in parts:
+                f.write(part)
+    except BaseException:
+        if progress["last_id"] is not None:
+            click.echo(f"Stopped; resume with --after-id {progress['last_id']}", err=True)
+        raise
+    click.echo(f"Exported up to booking id {progress['last_id']}")
+
+
+def init_app(app):
+    """Register the maintenance commands on the app's `flask` CLI."""
+    app.cli.add_command(backfill_analytics)
+    app.cli.add_command(export_bookings)
@@ -0,0 +1,131 @@
+import os
+
+from sqlalchemy import event
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+db_path = os.path.join(base_dir, 'instance', 'app.db')
+
+# Applied to every new SQLite connection. WAL lets readers keep going while
+# book_slot/approve_booking write; busy_timeout makes writers wait for the
+# lock instead of failing with "database is locked".
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # ms
+    "mmap_size": 268435456,        # 256 MB
+    "cache_size": -64000,          # negative = KiB, so ~64 MB
+    "temp_store": "MEMORY",
+}
+
+# Extra pragmas for the read-only engine
+SQLITE_READ_PRAGMAS = {
+    "query_only": "ON",
+}
+
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here-change-this-later')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', f'sqlite:///{db_path}')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # "development" or "testing" turns on the debug routes (/debug-login,
+    # /create-test-users, ...); anything else, including unset, is production
+    APP_ENV = os.environ.get('APP_ENV', 'production')
+
+    # Blueprints create_app() imports and registers (see BLUEPRINTS in
+    # __init__.py); "debug" is skipped unless APP_ENV enables it
+    BLUEPRINTS = ("auth", "student", "admin", "api", "debug")
+
+    # Production serving (gunicorn.conf.py / wsgi.py). The caches and the
+    # in-process event broker live in each worker process, and a publish only
+    # reaches the /api/events clients of the process it happened in, so the
+    # default is one gevent worker. More workers need an external broker.
+    WEB_BIND = os.environ.get('WEB_BIND', '0.0.0.0:8000')
+    WEB_WORKER_CLASS = os.environ.get('WEB_WORKER_CLASS', 'gevent')
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', 1))
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 8))            # gthread workers, waitress
+    WEB_CONNECTIONS = int(os.environ.get('WEB_CONNECTIONS', 1000))  # gevent workers
+    WARM_UP = os.environ.get('WARM_UP', '1') == '1'
+
+    # Open /api/events streams per process. Under gevent each one is a
+    # greenlet; with threaded servers each holds a server thread while
+    # connected, so keep this well below the thread count.
+    EVENT_STREAM_MAX_SUBSCRIBERS = int(os.environ.get(
+        'EVENT_STREAM_MAX_SUBSCRIBERS',
+        WEB_CONNECTIONS // 2 if WEB_WORKER_CLASS == 'gevent' else WEB_THREADS // 2))
+
+    # Write engine (the default bind)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get('DB_POOL_SIZE', 5)),
+        "max_overflow": int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        "pool_timeout": 30,
+        "connect_args": {"timeout": 15},
+    }
+
+    # Password hashing (werkzeug method string with every parameter given).
+    # Changing the method rehashes each user's password at their next login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_WAITING = int(os.environ.get('PASSWORD_HASH_MAX_WAITING', 8))
+
+    # Login attempts allowed per client IP / per account, per window (seconds)
+    LOGIN_IP_LIMIT = int(os.environ.get('LOGIN_IP_LIMIT', 20))
+    LOGIN_IP_WINDOW = int(os.environ.get('LOGIN_IP_WINDOW', 60))
+    LOGIN_ACCOUNT_LIMIT = int(os.environ.get('LOGIN_ACCOUNT_LIMIT', 5))
+    LOGIN_ACCOUNT_WINDOW = int(os.environ.get('LOGIN_ACCOUNT_WINDOW', 300))
+
+    # Reverse proxies in front of the app that set X-Forwarded-For/-Proto.
+    # 0 trusts none; otherwise request.remote_addr (used by the login rate
+    # limit) is the client address the outermost of them saw.
+    PROXY_FIX_HOPS = int(os.environ.get('PROXY_FIX_HOPS', 0))
+
+    # How book_slot picks a tutor for "any tutor" requests (see assignment.py)
+    TUTOR_ASSIGNMENT_POLICY = os.environ.get('TUTOR_ASSIGNMENT_POLICY', 'least_loaded')
+
+    # Notification emails (logged instead of sent when MAIL_SERVER is unset)
+    NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', 1))
+    MAIL_SERVER = os.environ.get('MAIL_SERVER')
+    MAIL_PORT = int(os.environ.get('MAIL_PORT', 25))
+    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS') == '1'
+
+    # Read engine for read-only lookups, same database file. Point
+    # DATABASE_READ_URL at a replica when not on SQLite.
+    SQLALCHEMY_BINDS = {
+        "read": {
+            "url": os.environ.get('DATABASE_READ_URL', SQLALCHEMY_DATABASE_URI),
+            "pool_size": int(os.environ.get('DB_READ_POOL_SIZE', 10)),
+            "max_overflow": int(os.environ.get('DB_READ_MAX_OVERFLOW', 20)),
+            "pool_timeout": 30,
+            "connect_args": {"timeout": 15},
+        },
+    }
+
+
+def register_sqlite_pragmas(engine, pragmas: dict):
+    """
+    Run PRAGMA statements on every new connection of a SQLite engine.
+    Does nothing for other databases.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def configure_engines(db):
+    """
+    Attach connection pragmas to the app's engines. Must be called inside an
+    app context, after db.init_app.
+    """
+    for bind, engine in db.engines.items():
+        pragmas = dict(SQLITE_PRAGMAS)
+        if bind == "read":
+            pragmas.update(SQLITE_READ_PRAGMAS)
+        register_sqlite_pragmas(engine, pragmas)
@@ -0,0 +1,265 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from . import queries
+
+
+class IntervalList:
+    """
+    Booking intervals kept sorted by start time.
+
+    Overlap lookups bisect to the first interval that could still reach the
+    window (start - longest interval) and walk forward until intervals start
+    after the window ends, so a lookup is O(log n + k).
+    """
+
+    def __init__(self):
+        self.starts = []  # sorted start times, parallel to items
+        self.items = []   # (start, end, booking_id)
+        self.max_length = timedelta(0)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, start: datetime, end: datetime, booking_id: int):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.items.insert(i, (start, end, booking_id))
+        if end - start > self.max_length:
+            self.max_length = end - start
+
+    def remove(self, start: datetime, booking_id: int) -> bool:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.items[i][2] == booking_id:
+                del self.starts[i]
+                del self.items[i]
+                return True
+            i += 1
+        return False
+
+    def overlapping(self, start: datetime, end: datetime) -> list:
+        """
+        Get the IDs of intervals overlapping [start, end).
+        """
+        i = bisect_right(self.starts, start - self.max_length)
+        result = []
+        while i < len(self.items) and self.items[i][0] < end:
+            if self.items[i][1] > start:
+                result.append(self.items[i][2])
+            i += 1
+        return result
+
+    def last_end_before(self, at: datetime):
+        """
+        Get the latest end time that is at or before `at`, or None.
+        """
+        i = bisect_left(self.starts, at)
+        latest = None
+        while i > 0:
+            i -= 1
+            start, end, _ = self.items[i]
+            if latest is not None and start + self.max_length <= latest:
+                # Earlier intervals can't end any later
+                break
+            if end <= at and (latest is None or end > latest):
+                latest = end
+        return latest
+
+
+class TutorIntervals:
+    """
+    One tutor's active (pending/accepted) bookings that end after `since`.
+    """
+
+    def __init__(self, since: datetime):
+        self.since = since
+        self.loaded_at = time.monotonic()
+        self.lists = {status: IntervalList() for status in queries.ACTIVE_STATUSES}
+        self.bookings = {}  # booking_id -> (status, start, end)
+
+    def add(self, booking_id: int, status: str, start: datetime, end: datetime):
+        self.remove(booking_id)
+        if status in self.lists and end > self.since:
+            self.lists[status].add(start, end, booking_id)
+            self.bookings[booking_id] = (status, start, end)
+
+    def remove(self, booking_id: int):
+        entry = self.bookings.pop(booking_id, None)
+        if entry:
+            status, start, _ = entry
+            self.lists[status].remove(start, booking_id)
+
+
+class ConflictIndex:
+    """
+    In-process per-tutor index of active bookings, used to pre-filter and
+    rank tutors (assignment.rank_tutors) without a query per tutor.
+
+    Advisory only: other worker processes and the CLI write without telling
+    this process, so it can be stale. Every authoritative overlap check
+    (book_slot, approve_booking, the bulk and series paths) runs in SQL
+    under the calendar lock instead, through queries.accepted_conflict and
+    queries.pending_overlaps on ix_booking_tutor_status_start.
+
+    A tutor's bookings are loaded on first use and then kept up to date by the
+    routes that create bookings or change their status. While a tutor is cold
+    (not loaded yet, or older than max_age) lookups fall back to SQL; the
+    max_age refresh also bounds staleness across processes.
+    """
+
+    def __init__(self, max_age: float = 60.0):
+        self.max_age = max_age
+        self._tutors = {}
+        self._changes = {}  # tutor_id -> number of record/discard calls
+        self._lock = threading.RLock()
+
+    def _entry(self, tutor_id: int, start: datetime):
+        with self._lock:
+            entry = self._tutors.get(tutor_id)
+            if entry is None or time.monotonic() - entry.loaded_at > self.max_age:
+                return None
+            if start < entry.since:
+                # Window reaches back before what was loaded
+                return None
+            return entry
+
+    def load(self, tutor_id: int, now: datetime = None):
+        """
+        Load (or reload) a tutor's active bookings that have not ended yet.
+        """
+        from .models import db, Booking
+
+        since = now or datetime.utcnow()
+        with self._lock:
+            changes_before = self._changes.get(tutor_id, 0)
+        rows = db.session.query(
+            Booking.id, Booking.status, Booking.start_time, Booking.end_time
+        ).filter(
+            Booking.tutor_id == tutor_id,
+            Booking.status.in_(queries.ACTIVE_STATUSES),
+            Booking.end_time > since
+        ).all()
+
+        entry = TutorIntervals(since)
+        for row in rows:
+            entry.add(row.id, row.status, row.start_time, row.end_time)
+
+        with self._lock:
+            # A booking committed while we were reading may be missing from
+            # `rows`; leave the tutor cold and load again next time.
+            if self._changes.get(tutor_id, 0) == changes_before:
+                self._tutors[tutor_id] = entry
+        return entry
+
+    def invalidate(self, tutor_id: int = None):
+        with self._lock:
+            if tutor_id is None:
+                self._tutors.clear()
+            else:
+                self._tutors.pop(tutor_id, None)
+
+    def record(self, booking):
+        """
+        Update the index after a booking was committed with a new status.
+        Bookings that are no longer pending/accepted are dropped.
+        """
+        self.mark(booking.tutor_id, booking.id, booking.status, booking.start_time, booking.end_time)
+
+    def mark(self, tutor_id: int, booking_id: int, status: str, start: datetime, end: datetime):
+        """
+        Same as record(), from plain values.
+        """
+        with self._lock:
+            self._changes[tutor_id] = self._changes.get(tutor_id, 0) + 1
+            entry = self._tutors.get(tutor_id)
+            if entry is not None:
+                entry.add(booking_id, status, start, end)
+
+    def discard(self, tutor_id: int, booking_ids):
+        """
+        Drop bookings from the index (e.g. after they were denied in bulk).
+        """
+        with self._lock:
+            self._changes[tutor_id] = self._changes.get(tutor_id, 0) + 1
+            entry = self._tutors.get(tutor_id)
+            if entry is not None:
+                for booking_id in booking_ids:
+                    entry.remove(booking_id)
+
+    def workload(self, tutor_id: int, at: datetime) -> tuple:
+        """
+        Summarize a tutor's calendar for assigning a booking at `at`.
+
+        Returns:
+            (number of active bookings not yet ended, latest end of an
+            active booking at or before `at` or None)
+        """
+        now = datetime.utcnow()
+        entry = self._entry(tutor_id, min(now, at)) or self.load(tutor_id, now)
+        with self._lock:
+            free_since = [entry.lists[status].last_end_before(at) for status in queries.ACTIVE_STATUSES]
+            free_since = [value for value in free_since if value is not None]
+            return len(entry.bookings), max(free_since) if free_since else None
+
+    def accepted_conflict(self, tutor_id: int, start: datetime, end: datetime):
+        """
+        Check whether [start, end) overlaps an accepted booking.
+
+        Returns:
+            ID of a conflicting accepted booking, or None
+        """
+        entry = self._entry(tutor_id, start)
+        if entry is None:
+            conflict = queries.accepted_conflict(tutor_id, start, end)
+            self.load(tutor_id)
+            return conflict.id if conflict else None
+
+        with self._lock:
+            ids = entry.lists["accepted"].overlapping(start, end)
+        return ids[0] if ids else None
+
+
+conflict_index = ConflictIndex()
+
+
+def resolve_approvals(candidates, accepted) -> tuple:
+    """
+    Decide which of a batch of pending bookings can be approved together.
+
+    One pass over the candidates sorted by (tutor, start time, position in
+    the batch): a candidate is approved unless it overlaps an already
+    accepted booking or a candidate approved earlier in the pass.
+
+    Args:
+        candidates: (tutor_id, start, end, booking_id) tuples, in batch order
+        accepted: tutor_id -> sorted list of (start, end) accepted intervals
+
+    Returns:
+        (approved_ids, conflicting_ids)
+    """
+    approved, conflicting = [], []
+    ordered = sorted(enumerate(candidates), key=lambda item: (item[1][0], item[1][1], item[0]))
+
+    current_tutor = None
+    max_end = None
+    for _, (tutor_id, start, end, booking_id) in ordered:
+        if tutor_id != current_tutor:
+            current_tutor = tutor_id
+            max_end = None
+            intervals = accepted.get(tutor_id, [])
+            accepted_starts = [interval[0] for interval in intervals]
+
+        # Last accepted booking starting before this one ends
+        i = bisect_left(accepted_starts, end) - 1
+        clashes_accepted = i >= 0 and intervals[i][1] > start
+        clashes_batch = max_end is not None and start < max_end
+
+        if clashes_accepted or clashes_batch:
+            conflicting.append(booking_id)
+        else:
+            approved.append(booking_id)
+            max_end = end if max_end is None else max(max_end, end)
+    return approved, conflicting
@@ -0,0 +1,217 @@
+from flask import Blueprint, request
+from werkzeug.security import generate_password_hash, check_password_hash
+from .models import db, User
+from .helpers import parse_email_input
+
+# Registered outside production only (see create_app)
+bp = Blueprint("debug", __name__)
+
+@bp.route("/debug-login")
+def debug_login():
+    """Debug login - check if users exist and test password"""
+    try:
+        admin = User.query.filter_by(email="admin@gmail.com").first()
+        
+        if not admin:
+            return "Admin user does NOT exist!<br><a href='/create-test-users'>Create test users</a>"
+        
+        # Test password
+        test_password = "admin"
+        password_match = check_password_hash(admin.password_hash, test_password)
+        
+        result = f"Admin user found!<br>"
+        result += f"Email: {admin.email}<br>"
+        result += f"Role: {admin.role}<br>"
+        result += f"Status: {admin.status}<br>"
+        result += f"Password hash: {admin.password_hash[:50]}...<br>"
+        result += f"Password 'admin' matches: {password_match}<br>"
+        
+        # Test with wrong password
+        wrong_match = check_password_hash(admin.password_hash, "wrong")
+        result += f"Password 'wrong' matches: {wrong_match}<br>"
+        
+        return result
+    except Exception as e:
+        return f"Error: {str(e)}<br><a href='/init-db'>Create tables first</a>"
+
+@bp.route("/check-users")
+def check_users():
+    """Check if test users exist and verify their credentials"""
+    try:
+        result = "<h2>User Database Check</h2>"
+        
+        # Check admin user by username
+        admin_by_username = User.query.filter_by(username="admin").first()
+        result += f"<h3>Admin by username 'admin':</h3>"
+        if admin_by_username:
+            result += f"✓ Found!<br>"
+            result += f"  - ID: {admin_by_username.id}<br>"
+            result += f"  - Username: {admin_by_username.username}<br>"
+            result += f"  - Email: {admin_by_username.email}<br>"
+            result += f"  - Role: {admin_by_username.role}<br>"
+            result += f"  - Status: {admin_by_username.status}<br>"
+            
+            # Test password
+            test_pass = "A12345"
+            password_match = check_password_hash(admin_by_username.password_hash, test_pass)
+            result += f"  - Password 'A12345' matches: {password_match}<br>"
+            if not password_match:
+                result += f"  - Password hash: {admin_by_username.password_hash[:50]}...<br>"
+        else:
+            result += "✗ NOT FOUND<br>"
+        
+        # Check admin user by email
+        admin_by_email = User.query.filter_by(email="admin@tutomatics.com").first()
+        result += f"<h3>Admin by email 'admin@tutomatics.com':</h3>"
+        if admin_by_email:
+            result += f"✓ Found!<br>"
+            result += f"  - Username: {admin_by_email.username}<br>"
+        else:
+            result += "✗ NOT FOUND<br>"
+        
+        # Check student user
+        student_by_username = User.query.filter_by(username="student").first()
+        result += f"<h3>Student by username 'student':</h3>"
+        if student_by_username:
+            result += f"✓ Found!<br>"
+            result += f"  - Username: {student_by_username.username}<br>"
+            result += f"  - Email: {student_by_username.email}<br>"
+            
+            # Test password
+            test_pass = "S12345"
+            password_match = check_password_hash(student_by_username.password_hash, test_pass)
+            result += f"  - Password 'S12345' matches: {password_match}<br>"
+        else:
+            result += "✗ NOT FOUND<br>"
+        
+        # List all users
+        all_users = User.query.all()
+        result += f"<h3>All users in database ({len(all_users)}):</h3>"
+        for u in all_users:
+            result += f"  - ID: {u.id}, Username: {u.username}, Email: {u.email}, Role: {u.role}<br>"
+        
+        result += "<br><a href='/create-test-users'>Create test users</a>"
+        return result
+    except Exception as e:
+        return f"Error: {str(e)}<br><a href='/init-db'>Initialize database</a>"
+
+@bp.route("/create-test-users")
+def create_test_users():
+    try:
+        User.query.filter_by(username="admin").delete()
+        User.query.filter_by(username="student").delete()
+        User.query.filter_by(email="admin@tutomatics.com").delete()
+        User.query.filter_by(email="student@tutomatics.com").delete()
+        db.session.commit()
+        
+        admin_user = User(
+            username="admin",
+            email="admin@tutomatics.com",
+            password_hash=generate_password_hash("A12345"),
+            role="admin",
+            status="approved"
+        )
+        
+        student_user = User(
+            username="student",
+            email="student@tutomatics.com",
+            password_hash=generate_password_hash("S12345"),
+            role="student",
+            status="approved"
+        )
+        
+        db.session.add(admin_user)
+        db.session.add(student_user)
+        db.session.commit()
+        
+        admin_check = User.query.filter_by(username="admin").first()
+        student_check = User.query.filter_by(username="student").first()
+        
+        result = "Test users created!<br><br>"
+        result += "Admin: username 'admin' or email 'admin@tutomatics.com' / password: A12345<br>"
+        result += "Student: username 'student' or email 'student@tutomatics.com' / password: S12345<br><br>"
+        
+        if admin_check:
+            result += "✓ Admin user verified<br>"
+        else:
+            result += "✗ Admin user NOT found<br>"
+            
+        if student_check:
+            result += "✓ Student user verified<br>"
+        else:
+            result += "✗ Student user NOT found<br>"
+        
+        result += "<br><a href='/check-users'>Check users</a>"
+        return result
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+@bp.route("/debug-login-step-by-step", methods=["GET", "POST"])
+def debug_login_step_by_step():
+    """Debug route to see exactly what happens at each login step"""
+    result = "<h2>Login Debug - Step by Step</h2>"
+    
+    if request.method == "POST":
+        raw_input = request.form.get("email")
+        password = request.form.get("password")
+        
+        result += f"<h3>Step 1: Raw Input</h3>"
+        result += f"Raw input received: '{raw_input}'<br>"
+        result += f"Password received: '{password}'<br><br>"
+        
+        result += f"<h3>Step 2: Parse Email Input</h3>"
+        try:
+            username, email = parse_email_input(raw_input)
+            result += f"✓ Parsed successfully<br>"
+            result += f"  Username returned: '{username}'<br>"
+            result += f"  Email returned: '{email}'<br><br>"
+        except ValueError as e:
+            result += f"✗ Parse failed: {str(e)}<br>"
+            return result
+        
+        result += f"<h3>Step 3: Database Query</h3>"
+        user_by_email = User.query.filter_by(email=email).first()
+        if user_by_email:
+            result += f"✓ User found by email '{email}'<br>"
+            result += f"  User ID: {user_by_email.id}<br>"
+            result += f"  Username: {user_by_email.username}<br>"
+            result += f"  Email: {user_by_email.email}<br>"
+            result += f"  Password hash: {user_by_email.password_hash[:50]}...<br><br>"
+        else:
+            result += f"✗ No user found with email '{email}'<br>"
+            result += f"<br>Trying username query...<br>"
+            user_by_username = User.query.filter_by(username=username).first()
+            if user_by_username:
+                result += f"✓ User found by username '{username}'<br>"
+                result += f"  User email in DB: '{user_by_username.email}'<br>"
+                result += f"  Expected email: '{email}'<br>"
+                result += f"  Match? {user_by_username.email.lower() == email.lower()}<br>"
+            else:
+                result += f"✗ No user found with username '{username}'<br>"
+            return result
+        
+        result += f"<h3>Step 4: Password Verification</h3>"
+        password_match = check_password_hash(user_by_email.password_hash, password)
+        result += f"Password match result: {password_match}<br>"
+        
+        if password_match:
+            result += f"<h3>✓ SUCCESS - Login should work!</h3>"
+        else:
+            result += f"<h3>✗ FAILED - Password doesn't match</h3>"
+            result += f"Testing with different passwords:<br>"
+            test_passwords = ["A12345", "admin", "S12345", "student"]
+            for test_pwd in test_passwords:
+                test_match = check_password_hash(user_by_email.password_hash, test_pwd)
+                result += f"  '{test_pwd}': {test_match}<br>"
+    
+    else:
+        result += """
+        <form method="POST">
+            <input type="text" name="email" placeholder="Email or Username" required><br><br>
+            <input type="password" name="password" placeholder="Password" required><br><br>
+            <button type="submit">Debug Login</button>
+        </form>
+        """
+    
+    result += "<br><br><a href='/check-users'>Check all users</a>"
+    return result
@@ -0,0 +1,160 @@
+import json
+import queue
+import threading
+
+from .cache import feed_versions
+
+# Seconds between keep-alive comments on idle streams
+HEARTBEAT_SECONDS = 15
+
+# Events a slow subscriber may fall behind before it is dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class TooManySubscribers(Exception):
+    """The process already serves as many streams as it is allowed to."""
+
+
+class Subscription:
+    """
+    One client's stream: a bounded queue fed by the broker.
+
+    Waiting on the queue holds the serving thread for as long as the client
+    stays connected (under a gevent worker only a greenlet, as queue.Queue is
+    patched). Thread-based servers must therefore cap the number of open
+    streams (EVENT_STREAM_MAX_SUBSCRIBERS) below their thread count.
+    """
+
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    def put(self, message: dict):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Client isn't keeping up; it will reconnect and re-fetch
+            self.closed = True
+
+    def messages(self, heartbeat: float = HEARTBEAT_SECONDS):
+        """
+        Yield messages as they arrive, or None after `heartbeat` idle seconds.
+        """
+        while not self.closed:
+            try:
+                yield self.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield None
+
+    def close(self):
+        self.closed = True
+        self.broker.unsubscribe(self)
+
+
+class InProcessBackend:
+    """
+    Delivers published messages to subscribers in this process only.
+
+    A backend has publish(channel, message) and start(deliver); a
+    multi-process deployment can swap in one backed by an external pub/sub
+    (e.g. Redis) that calls deliver(channel, message) for every message.
+    """
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, channel: str, message: dict):
+        self.deliver(channel, message)
+
+
+class EventBroker:
+    """
+    Channel-based pub/sub for server-sent events ("tutor:<id>", "student:<id>").
+    """
+
+    def __init__(self, backend=None):
+        self._subscribers = {}  # channel -> set of Subscription
+        self._lock = threading.Lock()
+        self.set_backend(backend or InProcessBackend())
+
+    def set_backend(self, backend):
+        self.backend = backend
+        backend.start(self._deliver)
+
+    def subscribe(self, channels, limit: int = None) -> Subscription:
+        """
+        Open a subscription to the given channels.
+
+        Raises:
+            TooManySubscribers: If `limit` subscriptions are already open
+        """
+        subscription = Subscription(self, channels)
+        with self._lock:
+            if limit is not None and self._count() >= limit:
+                raise TooManySubscribers()
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def publish(self, channel: str, message: dict):
+        self.backend.publish(channel, message)
+
+    def _deliver(self, channel: str, message: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+            if subscription.closed:
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+
+broker = EventBroker()
+
+
+def publish_booking_change(tutor_id: int, student_id, booking_id: int, status: str):
+    """
+    Tell calendars showing the tutor, and the booking's student, that a
+    booking was created or changed status. Their ICS feeds are rebuilt on
+    the next poll.
+    """
+    feed_versions.bump(tutor_id)
+    if student_id is not None:
+        feed_versions.bump(student_id)
+    message = {"type": "booking", "booking_id": booking_id, "status": status, "tutor_id": tutor_id}
+    broker.publish(f"tutor:{tutor_id}", message)
+    if student_id is not None:
+        broker.publish(f"student:{student_id}", message)
+
+
+def sse_stream(subscription: Subscription):
+    """
+    Format a subscription as a text/event-stream body. Unsubscribes when the
+    client disconnects.
+    """
+    try:
+        yield "retry: 5000\n\n"
+        for message in subscription.messages():
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
+    finally:
+        subscription.close()
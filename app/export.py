@@ -0,0 +1,189 @@
+import csv
+import io
+from importlib.util import find_spec
+
+# Parquet/Arrow export needs pyarrow; CSV always works. It is imported on
+# first use rather than with the admin blueprint, as it is slow to import.
+HAS_PYARROW = find_spec("pyarrow") is not None
+
+# Rows fetched per round trip and written per CSV block / Parquet row group
+CHUNK_SIZE = 5000
+
+COLUMNS = (
+    "id", "status", "start_time", "end_time", "lesson_minutes", "price_eur",
+    "created_at", "series_id",
+    "tutor_id", "tutor_username", "tutor_email",
+    "student_id", "student_username", "student_email",
+)
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def available_formats() -> list:
+    return [name for name in FORMATS if name == "csv" or HAS_PYARROW]
+
+
+def booking_chunks(session, start=None, end=None, tutor_id=None, statuses=None,
+                   after_id: int = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Stream bookings joined with their tutor and student, in id order.
+
+    Runs one query with a server-side cursor (stream_results) and hands out
+    chunk_size rows at a time, so memory stays flat however many rows match.
+
+    Args:
+        session: Database session
+        start, end: Only lessons starting in [start, end)
+        tutor_id: Only this tutor's bookings
+        statuses: Only bookings in these statuses
+        after_id: Keyset cursor; only bookings with a larger id (to resume)
+        chunk_size: Rows per chunk
+
+    Yields:
+        Lists of row tuples in COLUMNS order
+    """
+    from sqlalchemy.orm import aliased
+    from .models import Booking, User
+
+    tutor = aliased(User)
+    student = aliased(User)
+    query = session.query(
+        Booking.id, Booking.status, Booking.start_time, Booking.end_time,
+        Booking.lesson_minutes, Booking.price_eur, Booking.created_at, Booking.series_id,
+        Booking.tutor_id, tutor.username, tutor.email,
+        Booking.student_id, student.username, student.email,
+    ).join(tutor, Booking.tutor_id == tutor.id).join(student, Booking.student_id == student.id)
+
+    if start is not None:
+        query = query.filter(Booking.start_time >= start)
+    if end is not None:
+        query = query.filter(Booking.start_time < end)
+    if tutor_id is not None:
+        query = query.filter(Booking.tutor_id == tutor_id)
+    if statuses:
+        query = query.filter(Booking.status.in_(statuses))
+    if after_id is not None:
+        query = query.filter(Booking.id > after_id)
+
+    result = session.execute(
+        query.order_by(Booking.id).statement.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+def track_progress(chunks, progress: dict):
+    """
+    Pass chunks through, setting progress["last_id"] to the last booking id
+    of each chunk once the consumer has asked for the next one (i.e. after
+    it was written). That id is the keyset cursor to resume from.
+    """
+    for chunk in chunks:
+        yield chunk
+        progress["last_id"] = chunk[-1][0]
+
+
+def write_csv(chunks):
+    """
+    Generate CSV text: the header, then one block of lines per chunk.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+            for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+class _Drain(io.RawIOBase):
+    """
+    Write-only file that keeps what was written until drained, so a
+    Parquet/Arrow writer's output can be streamed as it is produced.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def _schema():
+    import pyarrow as pa
+
+    timestamp = pa.timestamp("us")
+    return pa.schema([
+        ("id", pa.int64()), ("status", pa.string()),
+        ("start_time", timestamp), ("end_time", timestamp),
+        ("lesson_minutes", pa.int32()), ("price_eur", pa.int32()),
+        ("created_at", timestamp), ("series_id", pa.string()),
+        ("tutor_id", pa.int64()), ("tutor_username", pa.string()), ("tutor_email", pa.string()),
+        ("student_id", pa.int64()), ("student_username", pa.string()), ("student_email", pa.string()),
+    ])
+
+
+def write_columnar(chunks, file_format: str):
+    """
+    Generate a Parquet file (one row group per chunk) or an Arrow IPC
+    stream (one record batch per chunk) as bytes, as it is written.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow is required for Parquet/Arrow export")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema()
+    sink = _Drain()
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for chunk in chunks:
+        columns = list(zip(*chunk))
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema
+        )
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+def write(chunks, file_format: str):
+    """
+    Generate the export in the given format (see FORMATS).
+    """
+    if file_format == "csv":
+        return write_csv(chunks)
+    return write_columnar(chunks, file_format)
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+
+from itsdangerous import URLSafeSerializer, BadSignature
+
+# Lessons included in a feed, relative to when it is built
+PAST_DAYS = 30
+FUTURE_DAYS = 365
+
+# Rows fetched per round trip while rendering
+BATCH_SIZE = 500
+
+# ICS lines are folded at 75 octets (RFC 5545, 3.1)
+LINE_LIMIT = 75
+
+EVENT_STATUS = {"accepted": "CONFIRMED", "pending": "TENTATIVE"}
+
+_SALT = "calendar-feed"
+
+
+def feed_token(secret_key: str, user_id: int, is_tutor: bool) -> str:
+    """
+    Sign the user's feed identity into a URL-safe token. The token is the
+    only credential the calendar URL carries, so it is never stored.
+    """
+    return URLSafeSerializer(secret_key, salt=_SALT).dumps([user_id, bool(is_tutor)])
+
+
+def read_token(secret_key: str, token: str) -> tuple:
+    """
+    Get (user_id, is_tutor) back from a feed token.
+
+    Raises:
+        ValueError: If the token was not signed with secret_key or is malformed
+    """
+    try:
+        user_id, is_tutor = URLSafeSerializer(secret_key, salt=_SALT).loads(token)
+        return int(user_id), bool(is_tutor)
+    except (BadSignature, TypeError, ValueError):
+        raise ValueError("Invalid feed token")
+
+
+def feed_rows(session, user_id: int, is_tutor: bool, start: datetime, end: datetime):
+    """
+    Stream the user's pending and accepted lessons starting in [start, end),
+    with the other party's username and email, batch by batch. Uses
+    ix_booking_tutor_status_start for tutors and ix_booking_student_start
+    for students.
+    """
+    from .models import Booking, User
+    from .queries import ACTIVE_STATUSES
+
+    owner = Booking.tutor_id if is_tutor else Booking.student_id
+    other = Booking.student_id if is_tutor else Booking.tutor_id
+    query = session.query(
+        Booking.id, Booking.status, Booking.start_time, Booking.end_time, Booking.created_at,
+        User.username.label("other_username"),
+        User.email.label("other_email")
+    ).join(User, other == User.id).filter(
+        owner == user_id,
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.start_time >= start,
+        Booking.start_time < end
+    ).order_by(Booking.start_time)
+    return query.yield_per(BATCH_SIZE)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _text(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """
+    Fold a content line into LINE_LIMIT-octet pieces, never splitting a
+    UTF-8 character.
+    """
+    if len(line.encode()) <= LINE_LIMIT:
+        return line + "\r\n"
+    pieces = []
+    piece, size, limit = "", 0, LINE_LIMIT
+    for char in line:
+        char_size = len(char.encode())
+        if size + char_size > limit:
+            pieces.append(piece)
+            piece, size, limit = "", 0, LINE_LIMIT - 1  # continuation lines start with a space
+        piece += char
+        size += char_size
+    pieces.append(piece)
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _event(row, host: str, stamp: str, is_tutor: bool) -> str:
+    title = f"Lesson with {row.other_username or row.other_email}"
+    if row.status == "pending":
+        title += " (awaiting approval)"
+    lines = (
+        "BEGIN:VEVENT",
+        f"UID:booking-{row.id}@{host}",
+        f"DTSTAMP:{_timestamp(row.created_at) if row.created_at else stamp}",
+        f"DTSTART:{_timestamp(row.start_time)}",
+        f"DTEND:{_timestamp(row.end_time)}",
+        f"SUMMARY:{_text(title)}",
+        f"STATUS:{EVENT_STATUS[row.status]}",
+        "TRANSP:OPAQUE" if is_tutor or row.status == "accepted" else "TRANSP:TRANSPARENT",
+        "END:VEVENT",
+    )
+    return "".join(_fold(line) for line in lines)
+
+
+def render(session, user_id: int, is_tutor: bool, host: str, now: datetime = None) -> bytes:
+    """
+    Build a user's iCalendar feed: one VEVENT per pending or accepted lesson
+    from PAST_DAYS ago to FUTURE_DAYS ahead. Each event is rendered as its
+    row arrives, so only one batch of rows is held at a time. Events are
+    stamped with the booking's creation time, so rebuilding unchanged data
+    gives the same bytes (and ETag).
+
+    Args:
+        session: Database session
+        user_id: Feed owner
+        is_tutor: True for a tutor's teaching calendar, False for a student's
+        host: Domain used in event UIDs
+        now: Build time (defaults to utcnow)
+
+    Returns:
+        The feed as UTF-8 bytes
+    """
+    now = now or datetime.utcnow()
+    stamp = _timestamp(now)
+    parts = [
+        "BEGIN:VCALENDAR\r\n",
+        "VERSION:2.0\r\n",
+        f"PRODID:-//{_text(host)}//Lessons//EN\r\n",
+        "CALSCALE:GREGORIAN\r\n",
+        "METHOD:PUBLISH\r\n",
+        _fold("X-WR-CALNAME:" + _text("Teaching schedule" if is_tutor else "Lessons")),
+    ]
+    rows = feed_rows(session, user_id, is_tutor, now - timedelta(days=PAST_DAYS), now + timedelta(days=FUTURE_DAYS))
+    parts.extend(_event(row, host, stamp, is_tutor) for row in rows)
+    parts.append("END:VCALENDAR\r\n")
+    return "".join(parts).encode()
@@ -1,16 +1,18 @@
 from flask import redirect, flash
-from flask_login import current_user
+from .identity import current_identity
 from functools import wraps
 from datetime import datetime, timedelta
 
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
+        # Role comes from the session identity, so no user row is loaded
+        identity = current_identity()
+        if identity is None:
             flash("Please log in to access this page.", "error")
             return redirect("/login")
         
-        if current_user.role != "admin":
+        if identity.role != "admin":
             flash("Access denied. Admin login required.", "error")
             return redirect("/")
         
@@ -42,6 +44,21 @@ def parse_email_input(raw: str):
 
 # Booking helper functions
 
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 string from the frontend into a naive UTC datetime.
+
+    Raises:
+        ValueError: If the string is not a valid ISO datetime
+        TypeError: If value is not a string (e.g. a number from JSON)
+    """
+    if not isinstance(value, str):
+        raise TypeError(f"Expected an ISO datetime string, got {type(value).__name__}")
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=None)
+    return parsed
+
 def calculate_price(lesson_minutes: int) -> int:
     """
     Calculate lesson price based on duration.
@@ -84,8 +101,9 @@ def slots_overlap(start1: datetime, end1: datetime, start2: datetime, end2: date
 def is_within_availability(tutor_id: int, start: datetime, end: datetime, db_session) -> bool:
     """
     Check if a booking time slot falls within tutor's availability blocks.
-    Note: This is a simplified check. For now, we'll check if the booking
-    time falls within any availability block for the given day.
+    Availability is compiled per tutor into 15-minute weekday bitmaps
+    (see availability.py), so after the first call this is a few bit
+    operations with no database query.
     
     Args:
         tutor_id: ID of the tutor/admin
@@ -96,26 +114,9 @@ def is_within_availability(tutor_id: int, start: datetime, end: datetime, db_ses
     Returns:
         True if booking is within availability, False otherwise
     """
-    from app import Availability
-    
-    # Get the day of the week (0=Monday, 6=Sunday)
-    booking_day = start.weekday()
-    booking_start_time = start.time()
-    booking_end_time = end.time()
-    
-    # Query availability blocks for this tutor
-    availabilities = db_session.query(Availability).filter_by(user_id=tutor_id).all()
-    
-    if not availabilities:
-        # No availability set = tutor is available all day (for now)
-        return True
-    
-    # Check if booking time falls within any availability block
-    for avail in availabilities:
-        if avail.start_time <= booking_start_time and booking_end_time <= avail.end_time:
-            return True
+    from .availability import availability_cache
     
-    return False
+    return availability_cache.get(tutor_id, db_session).contains(start, end)
 
 def get_booking_color(status: str) -> str:
     """
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import namedtuple
+
+from flask import g, session
+from flask_login import current_user
+
+# Seconds a role/status stored in the session is trusted before it is checked
+# against the user row again. Bounds how long a change made in another worker
+# process (which has its own revocation list) can go unnoticed.
+IDENTITY_TTL = 30
+
+SESSION_KEY = "identity"
+
+Identity = namedtuple("Identity", ["id", "role", "status"])
+
+
+class RevocationList:
+    """
+    Users whose role or status changed, with when it changed. A session
+    identity issued before that time is not trusted. Entries older than
+    IDENTITY_TTL are pruned, since such identities have expired anyway.
+    """
+
+    def __init__(self):
+        self._revoked = {}  # user_id -> time revoked
+        self._lock = threading.Lock()
+
+    def revoke(self, user_id: int):
+        now = time.time()
+        with self._lock:
+            self._revoked[user_id] = now
+            for key in [key for key, at in self._revoked.items() if now - at > IDENTITY_TTL]:
+                del self._revoked[key]
+
+    def revoked_since(self, user_id: int, issued_at: float) -> bool:
+        with self._lock:
+            revoked_at = self._revoked.get(user_id)
+        return revoked_at is not None and revoked_at >= issued_at
+
+
+revocations = RevocationList()
+
+
+def issue(user):
+    """
+    Store the user's role and status in the (signed) session cookie.
+    """
+    session[SESSION_KEY] = {
+        "id": user.id,
+        "role": user.role,
+        "status": user.status,
+        "at": time.time(),
+    }
+
+
+def current_identity():
+    """
+    Role and status of the logged-in user, or None if nobody is logged in.
+
+    Read from the session while it is younger than IDENTITY_TTL and the user
+    hasn't been revoked since, so authorization checks need no user row.
+    Otherwise the user is loaded once and the session identity re-issued.
+    The result is kept on `g` for the rest of the request.
+    """
+    if "identity" in g:
+        return g.identity
+
+    identity = None
+    payload = session.get(SESSION_KEY)
+    if (payload is not None
+            and str(payload["id"]) == session.get("_user_id")
+            and time.time() - payload["at"] <= IDENTITY_TTL
+            and not revocations.revoked_since(payload["id"], payload["at"])):
+        identity = Identity(payload["id"], payload["role"], payload["status"])
+    elif current_user.is_authenticated:
+        issue(current_user)
+        identity = Identity(current_user.id, current_user.role, current_user.status)
+    else:
+        session.pop(SESSION_KEY, None)
+
+    g.identity = identity
+    return identity
+
+
+def revoke(user_id: int):
+    """
+    Stop trusting the user's session identity and cached user row. Call
+    after changing a user's role or status, or deleting them.
+    """
+    from .users import user_cache
+
+    revocations.revoke(user_id)
+    user_cache.invalidate(user_id)
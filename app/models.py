@@ -0,0 +1,131 @@
+from datetime import datetime
+
+from flask_login import UserMixin
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import validates
+
+from .users import register_invalidation as register_user_invalidation
+from .availability import register_invalidation as register_availability_invalidation
+from .recurrence import parse_rule
+
+# Bound to the app in create_app()
+db = SQLAlchemy()
+
+
+class User(db.Model, UserMixin):
+    __tablename__ = "user"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), default="pending")
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Unread notifications, kept in step with Notification.is_read so the nav
+    # badge needs no COUNT query
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Login matches usernames case-insensitively
+        db.Index("ix_user_username_lower", db.func.lower(username)),
+    )
+
+register_user_invalidation(User)
+
+
+class Availability(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    repeat_rule = db.Column(db.String(255)) # daily/weekly/monthly/until date/etc. or an RRULE (see recurrence.py)
+    repeat_until = db.Column(db.DateTime, nullable=True)
+    starts_on = db.Column(db.Date, nullable=True)  # First date of the series (anchors INTERVAL/monthly rules)
+    user = db.relationship('User', backref=db.backref('availabilities', lazy=True))
+
+    @validates('repeat_rule')
+    def validate_repeat_rule(self, key, repeat_rule):
+        """Reject rules recurrence.parse_rule can't read (raises ValueError)."""
+        parse_rule(repeat_rule)
+        return repeat_rule
+
+    def validate_anchor(self):
+        """
+        Reject a COUNT rule without starts_on (raises ValueError): it would be
+        counted from recurrence.DEFAULT_ANCHOR and could run out before today.
+        Checked on insert and update, once every column is set.
+        """
+        if self.starts_on is None and parse_rule(self.repeat_rule).count is not None:
+            raise ValueError("A repeat_rule with COUNT needs starts_on")
+
+
+class BlockedDate(db.Model):
+    """One-off time a tutor is unavailable despite their availability rules."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.Time, nullable=True)  # None = the whole day
+    end_time = db.Column(db.Time, nullable=True)
+    reason = db.Column(db.String(120))
+    user = db.relationship('User', backref=db.backref('blocked_dates', lazy=True))
+
+    __table_args__ = (
+        db.Index("ix_blocked_date_user_date", "user_id", "date"),
+    )
+
+for event_name in ("before_insert", "before_update"):
+    event.listen(Availability, event_name, lambda mapper, connection, target: target.validate_anchor())
+
+register_availability_invalidation(Availability, BlockedDate)
+
+
+class Booking(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    tutor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    lesson_minutes = db.Column(db.Integer, nullable=False)  # Duration in minutes
+    price_eur = db.Column(db.Integer, nullable=False)  # Price in euros
+    status = db.Column(db.String(20), default="pending")  # pending/accepted/denied/cancelled
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    series_id = db.Column(db.String(32), nullable=True, index=True)  # Set on lessons booked together as a weekly series
+    
+    student = db.relationship("User", foreign_keys=[student_id], backref="student_bookings")
+    tutor = db.relationship("User", foreign_keys=[tutor_id], backref="tutor_bookings")
+
+    __table_args__ = (
+        db.Index("ix_booking_tutor_status_start", "tutor_id", "status", "start_time"),
+        db.Index("ix_booking_student_end", "student_id", "end_time"),
+        db.Index("ix_booking_status_start", "status", "start_time"),
+        db.Index("ix_booking_student_start", "student_id", "start_time", "id"),
+    )
+
+
+class Notification(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    message = db.Column(db.String(255), nullable=False)
+    is_read = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    user = db.relationship("User", backref=db.backref("notifications", lazy=True))
+
+    __table_args__ = (
+        db.Index("ix_notification_user_read_created", "user_id", "is_read", "created_at"),
+    )
+
+
+class DailyBookingStats(db.Model):
+    """Per tutor, per lesson day booking counts, kept up to date by analytics.py."""
+    __tablename__ = "daily_booking_stats"
+    
+    day = db.Column(db.Date, primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    pending_count = db.Column(db.Integer, nullable=False, default=0)
+    accepted_count = db.Column(db.Integer, nullable=False, default=0)
+    denied_count = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_count = db.Column(db.Integer, nullable=False, default=0)
+    accepted_minutes = db.Column(db.Integer, nullable=False, default=0)
+    accepted_revenue_eur = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,228 @@
+import logging
+import queue
+import random
+import threading
+from collections import Counter
+
+from .users import user_cache
+
+logger = logging.getLogger(__name__)
+
+# Jobs written per transaction
+BATCH_SIZE = 200
+
+# Attempts before a job is given up on, and the first retry delay in seconds
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+
+
+class LogTransport:
+    """
+    Default email transport: writes the email to the log. Swap in
+    SMTPTransport (or any object with send()) for real delivery.
+    """
+
+    def send(self, to: str, subject: str, body: str):
+        logger.info("Email to %s: %s - %s", to, subject, body)
+
+
+class MemoryTransport:
+    """
+    Keeps sent emails in a list, for local testing.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, to: str, subject: str, body: str):
+        self.sent.append((to, subject, body))
+
+
+class SMTPTransport:
+    def __init__(self, host: str, port: int = 25, sender: str = "no-reply@tutomatics.com",
+                 username: str = None, password: str = None, use_tls: bool = False):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, to: str, subject: str, body: str):
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class Job:
+    def __init__(self, user_id: int, message: str, subject: str = None):
+        self.user_id = user_id
+        self.message = message[:255]
+        self.subject = subject  # None = in-app notification only
+        self.attempts = 0
+        self.stored = False
+
+
+class Notifier:
+    """
+    Background pipeline for user notifications.
+
+    Routes call notify(), which only puts a job on an in-process queue. Worker
+    threads take jobs in batches, insert their Notification rows and bump the
+    users' unread counters with one executemany each per batch, then email the users that need it. Failed steps
+    are retried with exponential backoff. Jobs still queued when the process
+    exits are lost.
+    """
+
+    def __init__(self, transport=None, workers: int = 1):
+        self.transport = transport or LogTransport()
+        self.workers = workers
+        self.queue = queue.Queue()
+        self.app = None
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get("NOTIFICATION_WORKERS", self.workers)
+        if app.config.get("MAIL_SERVER"):
+            self.transport = SMTPTransport(
+                app.config["MAIL_SERVER"],
+                port=app.config.get("MAIL_PORT", 25),
+                username=app.config.get("MAIL_USERNAME"),
+                password=app.config.get("MAIL_PASSWORD"),
+                use_tls=app.config.get("MAIL_USE_TLS", False),
+            )
+
+    def notify(self, user_id: int, message: str, subject: str = None):
+        """
+        Queue a notification for a user; with a subject it is emailed too.
+        """
+        self._ensure_workers()
+        self.queue.put(Job(user_id, message, subject))
+
+    def _ensure_workers(self):
+        if self._threads or self.app is None:
+            return
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._run, name=f"notifier-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self.app.app_context():
+                    self.process(batch)
+            except Exception:
+                logger.exception("Notification batch failed")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def process(self, batch):
+        """
+        Store and deliver one batch of jobs. Must run in an app context.
+        """
+        from .models import db, Notification, User
+
+        to_store = [job for job in batch if not job.stored]
+        if to_store:
+            try:
+                db.session.execute(db.insert(Notification), [
+                    {"user_id": job.user_id, "message": job.message, "is_read": False}
+                    for job in to_store
+                ])
+                # Unread counters move in the same transaction as the rows
+                counts = Counter(job.user_id for job in to_store)
+                users = User.__table__
+                db.session.execute(
+                    users.update().where(users.c.id == db.bindparam("uid"))
+                    .values(unread_count=users.c.unread_count + db.bindparam("added")),
+                    [{"uid": user_id, "added": added} for user_id, added in counts.items()]
+                )
+                db.session.commit()
+                for user_id in counts:
+                    user_cache.invalidate(user_id)
+                for job in to_store:
+                    job.stored = True
+            except Exception:
+                db.session.rollback()
+                logger.exception("Storing %d notifications failed", len(to_store))
+                for job in to_store:
+                    self._retry(job)
+                return
+
+        to_email = [job for job in batch if job.subject]
+        if not to_email:
+            return
+        emails = dict(db.session.query(User.id, User.email).filter(
+            User.id.in_({job.user_id for job in to_email})))
+        for job in to_email:
+            email = emails.get(job.user_id)
+            if email is None:
+                continue
+            try:
+                self.transport.send(email, job.subject, job.message)
+            except Exception:
+                logger.exception("Emailing %s failed", email)
+                self._retry(job)
+
+    def _retry(self, job: Job):
+        job.attempts += 1
+        if job.attempts >= MAX_ATTEMPTS:
+            logger.error("Giving up on notification for user %s: %s", job.user_id, job.message)
+            return
+        delay = BASE_DELAY * (2 ** (job.attempts - 1)) * random.uniform(0.5, 1.5)
+        timer = threading.Timer(delay, self.queue.put, args=(job,))
+        timer.daemon = True
+        timer.start()
+
+    def wait(self):
+        """
+        Block until every queued job has been processed (retries excluded).
+        """
+        self.queue.join()
+
+
+notifier = Notifier()
+
+
+def notify_booking(user_id: int, status: str, start_time):
+    """
+    Queue an in-app notification and email about a booking's new status.
+    """
+    subject, message = booking_message(status, start_time)
+    notifier.notify(user_id, message, subject)
+
+
+def booking_message(status: str, start_time) -> tuple:
+    """
+    Subject and text for a booking status notification.
+    """
+    when = start_time.strftime("%a %d %b %Y, %H:%M")
+    if status == "accepted":
+        return "Booking approved", f"Your lesson on {when} has been approved."
+    if status == "denied":
+        return "Booking denied", f"Your booking request for {when} was denied."
+    return "Booking updated", f"Your booking for {when} is now {status}."
@@ -0,0 +1,131 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Werkzeug method string for new hashes, with every parameter spelled out so
+# stored hashes can be compared against it (see needs_rehash)
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+# Successful verifications remembered so repeat logins skip the hash
+VERIFY_CACHE_SIZE = 1024
+VERIFY_CACHE_SECONDS = 300
+
+
+def _executor_class():
+    """
+    ThreadPoolExecutor backed by real OS threads. Under gevent monkey-patching
+    the stdlib one would run hashes as greenlets and block the event loop.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+    if monkey.is_module_patched("threading"):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor
+    return ThreadPoolExecutor
+
+
+class HasherBusy(Exception):
+    """Raised when every hashing slot is taken and the wait timed out."""
+
+
+class PasswordHasher:
+    """
+    Password hashing policy plus a small pool of threads that run it.
+
+    Hashing is CPU-heavy by design. hashlib releases the GIL while it works,
+    so running it on `workers` threads caps how many cores logins can take,
+    and a semaphore caps how many requests may wait for a thread. Requests
+    beyond that get HasherBusy instead of piling up behind the calendar
+    traffic.
+    """
+
+    def __init__(self, method: str = DEFAULT_METHOD, workers: int = 2, max_waiting: int = 8,
+                 timeout: float = 5.0):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + max_waiting)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._verified = OrderedDict()  # digest -> time verified
+        self._key = os.urandom(32)
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self._slots = threading.BoundedSemaphore(
+            self.workers + app.config.get("PASSWORD_HASH_MAX_WAITING", 8))
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy()
+        try:
+            if self._executor is None:
+                with self._lock:
+                    if self._executor is None:
+                        self._executor = _executor_class()(self.workers, thread_name_prefix="hasher")
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured method.
+
+        Raises:
+            HasherBusy: If no hashing slot frees up in time
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str):
+        """
+        Check a password against its stored hash.
+
+        Returns:
+            (matches, new_hash): new_hash is a fresh hash to store when the
+            password matched but was hashed with an outdated method, else None
+
+        Raises:
+            HasherBusy: If no hashing slot frees up in time
+        """
+        digest = hmac.new(self._key, f"{password_hash}\0{password}".encode(), hashlib.sha256).digest()
+        if self._recently_verified(digest):
+            return True, None
+
+        if not self._run(check_password_hash, password_hash, password):
+            return False, None
+
+        self._remember(digest)
+        new_hash = self.hash(password) if self.needs_rehash(password_hash) else None
+        return True, new_hash
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split("$", 1)[0] != self.method
+
+    def _recently_verified(self, digest: bytes) -> bool:
+        with self._lock:
+            verified_at = self._verified.get(digest)
+            if verified_at is None:
+                return False
+            if time.monotonic() - verified_at > VERIFY_CACHE_SECONDS:
+                del self._verified[digest]
+                return False
+            return True
+
+    def _remember(self, digest: bytes):
+        with self._lock:
+            self._verified[digest] = time.monotonic()
+            self._verified.move_to_end(digest)
+            while len(self._verified) > VERIFY_CACHE_SIZE:
+                self._verified.popitem(last=False)
+
+
+hasher = PasswordHasher()
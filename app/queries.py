@@ -0,0 +1,346 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+# Longest lesson book_slot accepts. Overlap lookups use it as a lower bound on
+# start_time so the (.., start_time) indexes are scanned over a short range
+# instead of from the beginning of the booking history.
+MAX_LESSON_MINUTES = 240
+
+# Statuses that occupy a slot on the calendar
+ACTIVE_STATUSES = ("pending", "accepted")
+
+
+def overlapping(query, start, end):
+    """
+    Restrict a Booking query to rows overlapping [start, end).
+
+    Args:
+        query: Booking query to filter
+        start, end: Window start and end times
+
+    Returns:
+        Filtered query
+    """
+    from .models import Booking
+
+    earliest_start = start - timedelta(minutes=MAX_LESSON_MINUTES)
+    return query.filter(
+        Booking.start_time > earliest_start,
+        Booking.start_time < end,
+        Booking.end_time > start
+    )
+
+
+def accepted_conflict(tutor_id: int, start, end):
+    """
+    Find an accepted booking for a tutor that overlaps [start, end).
+    Uses ix_booking_tutor_status_start.
+
+    Returns:
+        The first conflicting Booking, or None
+    """
+    from .models import Booking
+
+    query = Booking.query.filter(
+        Booking.tutor_id == tutor_id,
+        Booking.status == "accepted"
+    )
+    return overlapping(query, start, end).first()
+
+
+def pending_overlaps(tutor_id: int, start, end, exclude_id=None):
+    """
+    Get a tutor's pending bookings that overlap [start, end).
+    Uses ix_booking_tutor_status_start.
+
+    Args:
+        tutor_id: ID of the tutor/admin
+        start, end: Window start and end times
+        exclude_id: Booking ID to leave out (usually the one being approved)
+
+    Returns:
+        List of Booking objects
+    """
+    from .models import Booking
+
+    query = Booking.query.filter(
+        Booking.tutor_id == tutor_id,
+        Booking.status == "pending"
+    )
+    if exclude_id is not None:
+        query = query.filter(Booking.id != exclude_id)
+    return overlapping(query, start, end).all()
+
+
+def student_upcoming(student_id: int, now):
+    """
+    Get a student's pending and accepted bookings that have not ended yet.
+    Uses ix_booking_student_end.
+    """
+    from .models import Booking
+
+    return Booking.query.filter(
+        Booking.student_id == student_id,
+        Booking.end_time >= now,
+        Booking.status.in_(ACTIVE_STATUSES)
+    ).order_by(Booking.start_time.asc()).all()
+
+
+def student_past(student_id: int, now, limit: int = None, cursor=None):
+    """
+    Get a student's bookings that have already ended, newest first.
+    Paged by keyset on (start_time, id) using ix_booking_student_start.
+
+    Args:
+        student_id: ID of the student
+        now: Current time
+        limit: Maximum rows to return (None for all)
+        cursor: (start_time, id) of the last row of the previous page
+
+    Returns:
+        List of Booking objects
+    """
+    from .models import Booking
+
+    query = _student_past_query(student_id, now)
+    if cursor is not None:
+        start_time, booking_id = cursor
+        query = query.filter(or_(
+            Booking.start_time < start_time,
+            and_(Booking.start_time == start_time, Booking.id < booking_id)
+        ))
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def student_past_stream(student_id: int, now, batch_size: int = 500):
+    """
+    Iterate over a student's entire past history, newest first, fetching
+    batch_size rows at a time so memory stays flat.
+    """
+    return _student_past_query(student_id, now).yield_per(batch_size)
+
+
+def _student_past_query(student_id: int, now):
+    from .models import Booking
+
+    # The redundant start_time bound lets SQLite walk ix_booking_student_start
+    # in order instead of sorting the whole history
+    return Booking.query.filter(
+        Booking.student_id == student_id,
+        Booking.start_time < now,
+        Booking.end_time < now
+    ).order_by(Booking.start_time.desc(), Booking.id.desc())
+
+
+def encode_cursor(row, field: str = "start_time") -> str:
+    return f"{getattr(row, field).isoformat()}|{row.id}"
+
+
+def decode_cursor(value):
+    """
+    Parse a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not value:
+        return None
+    start_time, _, booking_id = value.partition("|")
+    return datetime.fromisoformat(start_time), int(booking_id)
+
+
+def user_notifications(user_id: int, limit: int, cursor=None, unread_only: bool = False):
+    """
+    Get a user's notifications, newest first. Paged by keyset on
+    (created_at, id) using ix_notification_user_read_created.
+
+    Args:
+        user_id: ID of the user
+        limit: Maximum rows to return
+        cursor: (created_at, id) of the last row of the previous page
+        unread_only: Only return unread notifications
+
+    Returns:
+        List of Notification objects
+    """
+    from .models import Notification
+
+    query = Notification.query.filter(Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(Notification.is_read == False)
+    if cursor is not None:
+        created_at, notification_id = cursor
+        query = query.filter(or_(
+            Notification.created_at < created_at,
+            and_(Notification.created_at == created_at, Notification.id < notification_id)
+        ))
+    return query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit).all()
+
+
+def mark_notifications_read(user_id: int, notification_ids=None, batch_size: int = 500) -> int:
+    """
+    Mark a user's notifications as read and lower their unread counter by the
+    number of rows that actually changed. One UPDATE per batch of ids (or a
+    single UPDATE for all of them); the caller commits.
+
+    Args:
+        user_id: ID of the user
+        notification_ids: IDs to mark, or None for every unread notification
+        batch_size: IDs per UPDATE, kept under SQLite's bound-parameter limit
+
+    Returns:
+        Number of notifications that went from unread to read
+    """
+    from .models import db, Notification, User
+
+    unread = db.update(Notification).where(
+        Notification.user_id == user_id,
+        Notification.is_read == False
+    ).values(is_read=True).execution_options(synchronize_session=False)
+
+    if notification_ids is None:
+        marked = db.session.execute(unread).rowcount
+    else:
+        ids = sorted(set(notification_ids))
+        marked = 0
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            marked += db.session.execute(unread.where(Notification.id.in_(batch))).rowcount
+
+    if marked:
+        db.session.execute(
+            db.update(User).where(User.id == user_id)
+            .values(unread_count=User.unread_count - marked)
+            .execution_options(synchronize_session=False)
+        )
+    return marked
+
+
+def user_for_login(identifier: str):
+    """
+    Find the user for a login form entry in one query: by email, or by
+    username ignoring case (uses ix_user_username_lower). An email match
+    wins if both match different users.
+
+    Args:
+        identifier: An email address or a username
+
+    Returns:
+        User or None
+
+    Raises:
+        ValueError: If the input is not a valid email or username
+    """
+    from .models import db, User
+    from .helpers import parse_email_input
+
+    username, email = parse_email_input(identifier)
+    # Email match first, so it can't be cut off by several username matches
+    return User.query.filter(or_(
+        User.email == email,
+        db.func.lower(User.username) == username.lower()
+    )).order_by((User.email == email).desc()).first()
+
+
+def active_bookings_overlapping(start, end, session=None):
+    """
+    Get pending and accepted bookings overlapping [start, end), including
+    ones that started before the window. Uses ix_booking_status_start.
+    """
+    from .models import db, Booking
+
+    query = (session or db.session).query(Booking).filter(Booking.status.in_(ACTIVE_STATUSES))
+    return overlapping(query, start, end).order_by(Booking.start_time.asc()).all()
+
+
+def admin_booking_rows(status: str):
+    """
+    Get bookings with a given status together with their student's name and
+    email, in a single joined query. Only the columns the admin queue shows
+    are selected, so no ORM objects are built.
+
+    Returns:
+        List of rows with booking columns plus student_username/student_email
+    """
+    from .models import db, Booking, User
+
+    return db.session.query(
+        Booking.id,
+        Booking.start_time,
+        Booking.end_time,
+        Booking.lesson_minutes,
+        Booking.price_eur,
+        Booking.status,
+        Booking.created_at,
+        User.username.label("student_username"),
+        User.email.label("student_email")
+    ).join(User, Booking.student_id == User.id).filter(
+        Booking.status == status
+    ).order_by(Booking.start_time.asc()).all()
+
+
+def booking_students(booking_ids) -> dict:
+    """
+    Map booking IDs to (student_id, start_time) in one query.
+    """
+    from .models import db, Booking
+
+    if not booking_ids:
+        return {}
+    rows = db.session.query(Booking.id, Booking.student_id, Booking.start_time).filter(
+        Booking.id.in_(list(booking_ids)))
+    return {row.id: (row.student_id, row.start_time) for row in rows}
+
+
+def serialize_booking(row) -> dict:
+    """
+    Convert a Booking (or a row selecting the same columns) to the JSON shape
+    used by the booking APIs.
+    """
+    return {
+        'id': row.id,
+        'start_time': row.start_time.isoformat(),
+        'end_time': row.end_time.isoformat(),
+        'lesson_minutes': row.lesson_minutes,
+        'price_eur': row.price_eur,
+        'status': row.status,
+        'created_at': row.created_at.isoformat()
+    }
+
+
+@contextmanager
+def read_session():
+    """
+    Session on the read-only engine (config.py "read" bind). Objects loaded
+    through it stay usable after the block, but must not be modified.
+    """
+    from .models import db
+
+    engine = db.engines.get("read", db.engine)
+    session = Session(bind=engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def explain(query) -> list:
+    """
+    Run EXPLAIN QUERY PLAN for a query on SQLite.
+    Handy for checking which index a lookup uses.
+
+    Returns:
+        List of plan detail strings
+    """
+    from .models import db
+
+    statement = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}
+    )
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return [row[-1] for row in rows]
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """
+    Allows `capacity` hits at once, refilled at `rate` tokens per second.
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float):
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, capacity: float, rate: float) -> float:
+        """
+        Take one token.
+
+        Returns:
+            0 if a token was taken, else seconds until one is available
+        """
+        now = time.monotonic()
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / rate
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by e.g. IP address or account name.
+
+    Buckets live in this process only, so with several workers the real
+    limit is per worker. The least recently used buckets are dropped past
+    max_keys; a dropped bucket comes back full, which only errs towards
+    letting a request through.
+    """
+
+    def __init__(self, capacity: int, per_seconds: float, max_keys: int = 10000):
+        self.configure(capacity, per_seconds)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, capacity: int, per_seconds: float):
+        """Allow capacity hits per per_seconds from now on."""
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+
+    def hit(self, key) -> float:
+        """
+        Count a hit for key.
+
+        Returns:
+            0 if allowed, else seconds to wait before retrying
+        """
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.capacity)
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(self.capacity, self.rate)
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Login attempts: per client IP, and per account (the user's id, or the
+# entry itself when it matches nobody)
+login_ip_limiter = RateLimiter(capacity=20, per_seconds=60)
+login_account_limiter = RateLimiter(capacity=5, per_seconds=300)
+
+
+def init_app(app):
+    """Apply the LOGIN_* limits from the app config."""
+    login_ip_limiter.configure(app.config["LOGIN_IP_LIMIT"], app.config["LOGIN_IP_WINDOW"])
+    login_account_limiter.configure(app.config["LOGIN_ACCOUNT_LIMIT"], app.config["LOGIN_ACCOUNT_WINDOW"])
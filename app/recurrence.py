@@ -0,0 +1,186 @@
+import re
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
+WEEKDAY_CODES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+WEEKDAY_NAMES = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+
+# Anchor for rules without a start date, so INTERVAL=2 etc. still have a
+# fixed phase (a Monday)
+DEFAULT_ANCHOR = date(2024, 1, 1)
+
+
+class Rule:
+    """
+    A parsed recurrence rule.
+
+    Attributes:
+        freq: "DAILY", "WEEKLY" or "MONTHLY"
+        interval: Every how many days/weeks/months
+        by_day: Weekdays (0=Monday) for WEEKLY rules, or None for the
+            anchor's weekday
+        by_month_day: Days of the month for MONTHLY rules (negative counts
+            from the end, -1 = last day), or None for the anchor's day
+        count: Total number of occurrences, or None
+        until: Last date an occurrence may fall on, or None
+        exdates: Dates skipped even if the rule matches them
+    """
+
+    def __init__(self, freq="DAILY", interval=1, by_day=None, by_month_day=None,
+                 count=None, until=None, exdates=()):
+        self.freq = freq
+        self.interval = max(int(interval), 1)
+        self.by_day = tuple(sorted(set(by_day))) if by_day else None
+        self.by_month_day = tuple(by_month_day) if by_month_day else None
+        self.count = count
+        self.until = until
+        self.exdates = frozenset(exdates)
+
+
+def _parse_date(value: str) -> date:
+    value = value.strip()
+    if re.fullmatch(r"\d{8}(T\d{6}Z?)?", value):
+        return datetime.strptime(value[:8], "%Y%m%d").date()
+    return date.fromisoformat(value[:10])
+
+
+def _weekdays(value: str) -> list:
+    days = []
+    for token in re.findall(r"[A-Z]+", value.upper()):
+        for day, name in enumerate(WEEKDAY_NAMES):
+            if token in (WEEKDAY_CODES[day], name[:3], name):
+                days.append(day)
+    return days
+
+
+def parse_rule(repeat_rule) -> Rule:
+    """
+    Parse an Availability.repeat_rule.
+
+    Accepts RRULE-style rules ("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;
+    UNTIL=20300601;EXDATE=20300415") as well as the simple forms used so far:
+    empty (every day), "daily", "weekly", "monthly", weekday lists such as
+    "MO,TU,WE" or "Monday", optionally followed by "until <date>".
+
+    Raises:
+        ValueError: If the rule has an unknown FREQ or a malformed value
+    """
+    if not repeat_rule or not repeat_rule.strip():
+        return Rule()
+    text = repeat_rule.strip()
+    upper = text.upper()
+
+    if "FREQ=" in upper:
+        parts = {}
+        for part in re.split(r"[;\n]", upper):
+            key, _, value = part.partition("=")
+            if key.strip():
+                parts[key.strip().replace("RRULE:", "")] = value.strip()
+        freq = parts.get("FREQ", "DAILY")
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported FREQ: {freq}")
+        return Rule(
+            freq=freq,
+            interval=int(parts.get("INTERVAL", 1)),
+            by_day=_weekdays(parts["BYDAY"]) if "BYDAY" in parts else None,
+            by_month_day=[int(day) for day in parts["BYMONTHDAY"].split(",")] if "BYMONTHDAY" in parts else None,
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+            until=_parse_date(parts["UNTIL"]) if "UNTIL" in parts else None,
+            exdates=[_parse_date(value) for value in parts["EXDATE"].split(",")] if parts.get("EXDATE") else (),
+        )
+
+    # Simple forms
+    until = None
+    match = re.search(r"\bUNTIL\b\s*:?\s*(\S+)", upper)
+    if match:
+        until = _parse_date(match.group(1))
+        upper = upper[:match.start()]
+
+    days = _weekdays(upper)
+    if days:
+        return Rule("WEEKLY", by_day=days, until=until)
+    if "MONTHLY" in upper:
+        return Rule("MONTHLY", until=until)
+    if "WEEKLY" in upper:
+        return Rule("WEEKLY", until=until)
+    return Rule("DAILY", until=until)
+
+
+def occurrences(rule: Rule, start: date, end: date, anchor: date = None):
+    """
+    Lazily generate the dates in [start, end) on which a rule occurs.
+
+    Periods (days, weeks or months) before the window are skipped
+    arithmetically unless the rule has a COUNT, which has to be counted from
+    the anchor; either way nothing past `end` is generated, so unbounded
+    rules are safe to expand.
+
+    Args:
+        rule: Parsed rule
+        start: First date of the window
+        end: Day after the last date of the window
+        anchor: Date the series starts on (DEFAULT_ANCHOR if None)
+
+    Yields:
+        date objects in increasing order
+    """
+    anchor = anchor or DEFAULT_ANCHOR
+    last = end - timedelta(days=1)
+    if rule.until is not None:
+        last = min(last, rule.until)
+    if last < anchor or last < start:
+        return
+
+    emitted = 0
+    for day in _candidates(rule, anchor, start if rule.count is None else anchor):
+        if day > last:
+            return
+        if day < anchor:
+            continue
+        if rule.count is not None:
+            if emitted >= rule.count:
+                return
+            emitted += 1
+        if day >= start and day not in rule.exdates:
+            yield day
+
+
+def _candidates(rule: Rule, anchor: date, skip_to: date):
+    """
+    Every date the rule's pattern matches from the period holding skip_to
+    on, ignoring COUNT/UNTIL/EXDATE.
+    """
+    if rule.freq == "DAILY":
+        period = max((skip_to - anchor).days // rule.interval, 0)
+        day = anchor + timedelta(days=period * rule.interval)
+        while True:
+            yield day
+            day += timedelta(days=rule.interval)
+
+    elif rule.freq == "WEEKLY":
+        weekdays = rule.by_day or (anchor.weekday(),)
+        first_week = anchor - timedelta(days=anchor.weekday())
+        period = max((skip_to - first_week).days // 7 // rule.interval, 0)
+        week = first_week + timedelta(weeks=period * rule.interval)
+        while True:
+            for weekday in weekdays:
+                yield week + timedelta(days=weekday)
+            week += timedelta(weeks=rule.interval)
+
+    else:  # MONTHLY
+        month_days = rule.by_month_day or (anchor.day,)
+        months = (skip_to.year - anchor.year) * 12 + skip_to.month - anchor.month
+        index = anchor.year * 12 + anchor.month - 1 + max(months // rule.interval, 0) * rule.interval
+        while True:
+            year, month = divmod(index, 12)
+            length = monthrange(year, month + 1)[1]
+            days = sorted({
+                day if day > 0 else length + 1 + day
+                for day in month_days
+                if 1 <= (day if day > 0 else length + 1 + day) <= length
+            })
+            for day in days:
+                yield date(year, month + 1, day)
+            index += rule.interval
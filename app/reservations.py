@@ -0,0 +1,68 @@
+import random
+import time
+
+from sqlalchemy.exc import OperationalError
+
+# Retries when the write lock can't be taken within busy_timeout
+RETRIES = 5
+BASE_DELAY = 0.05  # seconds, doubled each attempt
+
+
+class ReservationBusy(Exception):
+    """The write lock could not be taken after all retries."""
+
+
+def lock_tutor_calendars(session, tutor_ids):
+    """
+    Serialize writers on the tutors' calendars for the rest of the transaction.
+
+    SQLite: BEGIN IMMEDIATE takes the database write lock up front, so the
+    conflict check and the write that follows can't interleave with another
+    writer. Other databases: lock the tutors' user rows (SELECT ... FOR UPDATE),
+    in id order so two writers can't deadlock.
+    """
+    from .models import User
+
+    connection = session.connection()
+    if connection.dialect.name == "sqlite":
+        dbapi_connection = connection.connection.dbapi_connection
+        if not dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        session.query(User.id).filter(
+            User.id.in_(sorted(set(tutor_ids)))
+        ).order_by(User.id).with_for_update().all()
+
+
+def _is_lock_error(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return "locked" in message or "busy" in message or "deadlock" in message
+
+
+def with_calendar_lock(session, tutor_ids, work):
+    """
+    Run work() while holding the tutors' calendar locks and commit.
+
+    work() does its conflict checks and writes and returns a result; if it
+    decides not to write it can simply return. Lock timeouts are retried with
+    jittered exponential backoff.
+
+    Raises:
+        ReservationBusy: If the lock is still held by others after RETRIES
+    """
+    for attempt in range(RETRIES + 1):
+        try:
+            lock_tutor_calendars(session, tutor_ids)
+            result = work()
+            session.commit()
+            return result
+        except OperationalError as e:
+            session.rollback()
+            if not _is_lock_error(e):
+                raise
+            if attempt == RETRIES:
+                raise ReservationBusy() from e
+            time.sleep(BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+        except Exception:
+            session.rollback()
+            raise
@@ -0,0 +1,77 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from .availability import availability_cache
+from .recurrence import Rule, occurrences
+from . import queries
+
+# Longest series one request may book (a school term and a bit)
+MAX_SERIES_LENGTH = 26
+
+
+def series_times(first_start: datetime, lesson_minutes: int, count: int = None,
+                 until=None, interval_weeks: int = 1) -> list:
+    """
+    Get the (start, end) times of a weekly lesson series.
+
+    Args:
+        first_start: Start of the first lesson
+        lesson_minutes: Length of each lesson
+        count: Number of lessons, or None to run until `until`
+        until: Last date a lesson may fall on
+        interval_weeks: 1 for every week, 2 for every other week, ...
+
+    Returns:
+        At most MAX_SERIES_LENGTH (start, end) tuples in order
+    """
+    count = min(count or MAX_SERIES_LENGTH, MAX_SERIES_LENGTH)
+    rule = Rule("WEEKLY", interval=interval_weeks, by_day=(first_start.weekday(),), count=count, until=until)
+    first_day = first_start.date()
+    window_end = first_day + timedelta(weeks=interval_weeks * count)
+    length = timedelta(minutes=lesson_minutes)
+    return [
+        (start, start + length)
+        for start in (datetime.combine(day, first_start.time())
+                      for day in occurrences(rule, first_day, window_end, first_day))
+    ]
+
+
+def series_conflicts(tutor_id: int, times: list, db_session) -> set:
+    """
+    Find the lessons of a series the tutor can't take.
+
+    Availability is checked against the compiled bitmaps; accepted bookings
+    come from one range query over the whole series, matched to lessons by
+    bisecting (the lessons are sorted and don't overlap each other, so each
+    accepted booking clashes with a contiguous run of them).
+
+    Args:
+        tutor_id: ID of the tutor
+        times: Sorted (start, end) tuples from series_times()
+        db_session: Database session object
+
+    Returns:
+        Indexes into `times` of lessons outside availability or overlapping
+        an accepted booking
+    """
+    from .models import Booking
+
+    if not times:
+        return set()
+
+    weekly = availability_cache.get(tutor_id, db_session)
+    conflicts = {i for i, (start, end) in enumerate(times) if not weekly.contains(start, end)}
+
+    query = db_session.query(Booking.start_time, Booking.end_time).filter(
+        Booking.tutor_id == tutor_id,
+        Booking.status == "accepted"
+    )
+    accepted = queries.overlapping(query, times[0][0], times[-1][1]).all()
+
+    starts = [start for start, _ in times]
+    ends = [end for _, end in times]
+    for accepted_start, accepted_end in accepted:
+        first = bisect_right(ends, accepted_start)
+        last = bisect_left(starts, accepted_end)
+        conflicts.update(range(first, last))
+    return conflicts
@@ -0,0 +1,241 @@
+import heapq
+from datetime import datetime, timedelta
+
+from .availability import availability_cache
+
+# Bookable hours shown on the calendar (see Docs/BOOKING_RULES.md)
+DAY_START_HOUR = 8
+DAY_END_HOUR = 22
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = (DAY_END_HOUR - DAY_START_HOUR) * 60 // SLOT_MINUTES  # 56
+
+# One character per slot in the calendar grid
+GRID_CODES = {
+    "available": "A",
+    "pending": "P",
+    "accepted": "X",
+    "unavailable": "U",
+    "past": "D",
+}
+
+# When several tutors' grids are combined, a slot shows the most bookable
+# status any of them has (past is the same for everyone)
+GRID_PRIORITY = [GRID_CODES[status] for status in ("past", "available", "pending", "accepted", "unavailable")]
+
+# Free windows are computed one chunk of days at a time, so a multi-month
+# range never holds more than a chunk of bookings in memory.
+CHUNK_DAYS = 7
+
+
+def sweep_free(available, busy) -> list:
+    """
+    Sweep-line merge of available and busy intervals.
+
+    Args:
+        available: (start, end) intervals the tutor can teach in
+        busy: (start, end) intervals already taken
+
+    Returns:
+        Sorted, merged (start, end) intervals that are available and not busy
+    """
+    events = []
+    for start, end in available:
+        events.append((start, 1, 0))
+        events.append((end, -1, 0))
+    for start, end in busy:
+        events.append((start, 0, 1))
+        events.append((end, 0, -1))
+    events.sort(key=lambda event: event[0])
+
+    free = []
+    open_count = busy_count = 0
+    free_start = None
+    i = 0
+    while i < len(events):
+        at = events[i][0]
+        # Apply every event at this instant before deciding the state
+        while i < len(events) and events[i][0] == at:
+            open_count += events[i][1]
+            busy_count += events[i][2]
+            i += 1
+        is_free = open_count > 0 and busy_count == 0
+        if is_free and free_start is None:
+            free_start = at
+        elif not is_free and free_start is not None:
+            if free and free[-1][1] == free_start:
+                free[-1] = (free[-1][0], at)
+            else:
+                free.append((free_start, at))
+            free_start = None
+    return free
+
+
+def _available_intervals(weekly, day_from, day_to):
+    day = day_from
+    while day < day_to:
+        midnight = datetime.combine(day, datetime.min.time())
+        for start_minute, end_minute in weekly.intervals(day):
+            start_minute = max(start_minute, DAY_START_HOUR * 60)
+            end_minute = min(end_minute, DAY_END_HOUR * 60)
+            if start_minute < end_minute:
+                yield (midnight + timedelta(minutes=start_minute),
+                       midnight + timedelta(minutes=end_minute))
+        day += timedelta(days=1)
+
+
+def free_windows(tutor_id: int, start: datetime, end: datetime, minutes: int, db_session):
+    """
+    Generate free booking windows for a tutor in [start, end).
+
+    A window is a maximal interval inside the tutor's availability and the
+    calendar hours that does not overlap an accepted booking, and is at least
+    `minutes` long. Work is done CHUNK_DAYS at a time.
+
+    Yields:
+        (start, end) datetime tuples in order
+    """
+    from .models import Booking
+    from . import queries
+
+    weekly = availability_cache.get(tutor_id, db_session)
+    min_length = timedelta(minutes=minutes)
+    carried = None  # last window of the previous chunk, may continue
+
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS), end)
+
+        available = [
+            (max(s, chunk_start), min(e, chunk_end))
+            for s, e in _available_intervals(weekly, chunk_start.date(), chunk_end.date() + timedelta(days=1))
+            if s < chunk_end and e > chunk_start
+        ]
+        busy_query = db_session.query(Booking.start_time, Booking.end_time).filter(
+            Booking.tutor_id == tutor_id,
+            Booking.status == "accepted"
+        )
+        busy = queries.overlapping(busy_query, chunk_start, chunk_end).all()
+
+        for window in sweep_free(available, busy):
+            if carried is not None and carried[1] == window[0]:
+                carried = (carried[0], window[1])
+                continue
+            if carried is not None and carried[1] - carried[0] >= min_length:
+                yield carried
+            carried = window
+
+        chunk_start = chunk_end
+
+    if carried is not None and carried[1] - carried[0] >= min_length:
+        yield carried
+
+
+def _slot_range(start: datetime, end: datetime, week_start: datetime):
+    """
+    Map [start, end) onto grid slot indexes [first, last) across the week,
+    where slot index = day * SLOTS_PER_DAY + slot of the day.
+    """
+    def index(at, round_up):
+        offset = (at - week_start).total_seconds() / 60
+        day = int(offset // (24 * 60))
+        minute = offset - day * 24 * 60 - DAY_START_HOUR * 60
+        slot = -(-minute // SLOT_MINUTES) if round_up else minute // SLOT_MINUTES
+        return day, min(max(int(slot), 0), SLOTS_PER_DAY)
+
+    first_day, first_slot = index(start, False)
+    last_day, last_slot = index(end, True)
+    for day in range(max(first_day, 0), min(last_day, 6) + 1):
+        lo = first_slot if day == first_day else 0
+        hi = last_slot if day == last_day else SLOTS_PER_DAY
+        if lo < hi:
+            yield day * SLOTS_PER_DAY + lo, day * SLOTS_PER_DAY + hi
+
+
+def week_grid(weekly, bookings, week_start: datetime, now: datetime) -> list:
+    """
+    Compute the status of every 15-minute calendar slot in a week.
+
+    Bookings are applied with difference arrays (+1 at the first slot, -1
+    after the last, then a running sum), so the cost is O(slots + bookings)
+    rather than slots x bookings.
+
+    Args:
+        weekly: The tutor's TutorAvailability
+        bookings: (start, end, status) of pending/accepted bookings
+        week_start: Datetime of the first day's midnight
+        now: Slots starting before this are past
+
+    Returns:
+        7 strings of SLOTS_PER_DAY GRID_CODES characters, one per day
+    """
+    total = 7 * SLOTS_PER_DAY
+    diffs = {"pending": [0] * (total + 1), "accepted": [0] * (total + 1)}
+    for start, end, status in bookings:
+        for lo, hi in _slot_range(start, end, week_start):
+            diffs[status][lo] += 1
+            diffs[status][hi] -= 1
+
+    days = []
+    pending = accepted = 0
+    for day in range(7):
+        day_start = week_start + timedelta(days=day)
+        codes = []
+        for slot in range(SLOTS_PER_DAY):
+            i = day * SLOTS_PER_DAY + slot
+            pending += diffs["pending"][i]
+            accepted += diffs["accepted"][i]
+            slot_start = day_start + timedelta(minutes=DAY_START_HOUR * 60 + slot * SLOT_MINUTES)
+            if slot_start < now:
+                codes.append(GRID_CODES["past"])
+            elif accepted:
+                codes.append(GRID_CODES["accepted"])
+            elif pending:
+                codes.append(GRID_CODES["pending"])
+            elif not weekly.empty and not _slot_available(weekly, slot_start):
+                codes.append(GRID_CODES["unavailable"])
+            else:
+                codes.append(GRID_CODES["available"])
+        days.append("".join(codes))
+    return days
+
+
+def combine_grids(grids) -> list:
+    """
+    Merge several tutors' week grids into one, slot by slot, using
+    GRID_PRIORITY.
+
+    Args:
+        grids: Non-empty list of week_grid() results
+
+    Returns:
+        7 strings of SLOTS_PER_DAY GRID_CODES characters, one per day
+    """
+    rank = {code: i for i, code in enumerate(GRID_PRIORITY)}
+    return [
+        "".join(min(codes, key=rank.__getitem__) for codes in zip(*day_grids))
+        for day_grids in zip(*grids)
+    ]
+
+
+def free_windows_any(tutor_ids, start: datetime, end: datetime, minutes: int, db_session):
+    """
+    Generate free booking windows of several tutors, merged in (start,
+    tutor_id) order. Each tutor's windows come from their own free_windows()
+    generator.
+
+    Yields:
+        (start, end, tutor_id) tuples
+    """
+    def tagged(tutor_id):
+        for window_start, window_end in free_windows(tutor_id, start, end, minutes, db_session):
+            yield window_start, window_end, tutor_id
+
+    return heapq.merge(*(tagged(tutor_id) for tutor_id in tutor_ids),
+                       key=lambda window: (window[0], window[2]))
+
+
+def _slot_available(weekly, slot_start: datetime) -> bool:
+    minute = slot_start.hour * 60 + slot_start.minute
+    bit = 1 << (minute // SLOT_MINUTES)
+    return bool(weekly.day_mask(slot_start.date()) & bit)
@@ -0,0 +1,80 @@
+"""
+Startup benchmark: how long a worker takes to import the package and build
+the app, and how long each further create_app() takes (the per-test cost).
+
+    python -m app.startup_bench [--runs 5] [--json]
+
+Cold timings run in fresh interpreters and exclude interpreter start-up.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+COLD_IMPORT = """
+import time
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start)
+"""
+
+COLD_CREATE = """
+import time
+start = time.perf_counter()
+from app import create_app
+create_app()
+print(time.perf_counter() - start)
+"""
+
+
+def _cold(code: str, runs: int) -> list:
+    return [
+        float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+
+
+def _warm_create(runs: int) -> list:
+    from . import create_app
+
+    create_app()  # first call pays for the imports
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        create_app()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(runs: int = 5) -> dict:
+    """
+    Returns:
+        Median milliseconds for import_app, first_create_app (import and
+        build) and create_app (each app after the first)
+    """
+    results = {
+        "import_app": _cold(COLD_IMPORT, runs),
+        "first_create_app": _cold(COLD_CREATE, runs),
+        "create_app": _warm_create(runs),
+    }
+    return {name: round(statistics.median(timings) * 1000, 1) for name, timings in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print one JSON object (for tracking over time)")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for name, ms in results.items():
+            print(f"{name:<18} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
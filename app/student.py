@@ -0,0 +1,182 @@
+from flask import Blueprint, current_app, jsonify, request, render_template, redirect, stream_with_context
+from flask_login import login_required, current_user
+from datetime import datetime
+from .models import db, Booking
+from .cache import booking_versions
+from .events import publish_booking_change
+from .identity import current_identity
+from .conflicts import conflict_index
+from .reservations import with_calendar_lock, ReservationBusy
+from . import queries, analytics
+import json
+
+bp = Blueprint("student", __name__)
+
+@bp.route("/student/dashboard")
+@login_required
+def student_dashboard():
+    # Check if student is approved
+    if current_identity().status != "approved":
+        return render_template("student/pending.html")
+    
+    return render_template("student/dashboard.html")
+
+@bp.route("/student/home")
+@login_required
+def student_home():
+    if current_identity().status != "approved":
+        return redirect("/student/dashboard")
+    return render_template("index.html")
+
+@bp.route("/student/calendar")
+@login_required
+def student_calendar():
+    if current_identity().status != "approved":
+        return redirect("/student/dashboard")
+    return render_template("student/calendar.html")
+
+@bp.route("/student/bookings")
+@login_required
+def student_bookings():
+    """
+    Student's upcoming bookings page (pending and accepted).
+    """
+    if current_identity().status != "approved":
+        return redirect("/student/dashboard")
+    return render_template("student/bookings.html")
+
+@bp.route("/student/history")
+@login_required
+def student_history():
+    """
+    Student's past bookings history page.
+    """
+    if current_identity().status != "approved":
+        return redirect("/student/dashboard")
+    return render_template("student/history.html")
+
+@bp.route("/api/student/bookings")
+@login_required
+def student_bookings_api():
+    """
+    Get current user's upcoming bookings (pending and accepted).
+    """
+    if current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    now = datetime.utcnow()
+    bookings = queries.student_upcoming(current_user.id, now)
+    
+    bookings_data = [queries.serialize_booking(booking) for booking in bookings]
+    
+    return jsonify({"success": True, "bookings": bookings_data})
+
+@bp.route("/api/student/history")
+@login_required
+def student_history_api():
+    """
+    Get current user's past bookings, newest first, one page at a time.
+    Query params: limit (default 50, max 200), cursor (next_cursor from the
+    previous page). With format=ndjson the whole history is streamed instead,
+    one JSON object per line.
+    """
+    if current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    now = datetime.utcnow()
+    
+    if request.args.get('format') == 'ndjson':
+        rows = queries.student_past_stream(current_user.id, now)
+        lines = (json.dumps(queries.serialize_booking(row)) + "\n" for row in rows)
+        return current_app.response_class(stream_with_context(lines), mimetype="application/x-ndjson")
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+        cursor = queries.decode_cursor(request.args.get('cursor'))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid limit or cursor"}), 400
+    
+    # Fetch one extra row to know whether another page exists
+    bookings = queries.student_past(current_user.id, now, limit=limit + 1, cursor=cursor)
+    next_cursor = None
+    if len(bookings) > limit:
+        bookings = bookings[:limit]
+        next_cursor = queries.encode_cursor(bookings[-1])
+    
+    bookings_data = [queries.serialize_booking(booking) for booking in bookings]
+    
+    return jsonify({"success": True, "bookings": bookings_data, "next_cursor": next_cursor})
+
+@bp.route("/student/bookings/<int:booking_id>/cancel", methods=["POST"])
+@login_required
+def cancel_booking(booking_id):
+    """
+    Cancel a pending booking (students can only cancel pending bookings).
+    """
+    if current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    booking = Booking.query.get(booking_id)
+    
+    if not booking:
+        return jsonify({"success": False, "error": "Booking not found"}), 404
+    
+    if booking.student_id != current_user.id:
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    if booking.status != "pending":
+        return jsonify({"success": False, "error": f"Cannot cancel booking with status: {booking.status}"}), 400
+    
+    # Only cancel it if it is still pending once we hold the calendar lock;
+    # it may have been approved or denied in the meantime
+    try:
+        changed = with_calendar_lock(db.session, [booking.tutor_id], lambda: analytics.change_status(
+            db.session, [booking_id], "pending", "cancelled"))
+    except ReservationBusy:
+        return jsonify({"success": False, "error": "The calendar is busy, please try again"}), 503
+    
+    if not changed:
+        return jsonify({"success": False, "error": f"Cannot cancel booking with status: {booking.status}"}), 409
+    
+    conflict_index.record(booking)
+    booking_versions.bump(booking.tutor_id)
+    publish_booking_change(booking.tutor_id, booking.student_id, booking.id, booking.status)
+    
+    return jsonify({
+        "success": True,
+        "message": "Booking cancelled successfully"
+    })
+
+@bp.route("/student/series/<series_id>/cancel", methods=["POST"])
+@login_required
+def cancel_series(series_id):
+    """
+    Cancel every still-pending lesson of one of the student's series, with
+    one UPDATE.
+    """
+    if current_identity().status != "approved":
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    
+    rows = db.session.query(Booking.id, Booking.tutor_id).filter(
+        Booking.series_id == series_id,
+        Booking.student_id == current_user.id,
+        Booking.status == "pending"
+    ).all()
+    
+    if not rows:
+        return jsonify({"success": False, "error": "No pending lessons in this series"}), 404
+    
+    booking_ids = analytics.change_status(db.session, [row.id for row in rows], "pending", "cancelled")
+    db.session.commit()
+    rows = [row for row in rows if row.id in booking_ids]
+    
+    for tutor_id in {row.tutor_id for row in rows}:
+        conflict_index.discard(tutor_id, [row.id for row in rows if row.tutor_id == tutor_id])
+        booking_versions.bump(tutor_id)
+        publish_booking_change(tutor_id, current_user.id, booking_ids[0], "cancelled")
+    
+    return jsonify({
+        "success": True,
+        "cancelled": len(booking_ids),
+        "message": "Series cancelled successfully"
+    })
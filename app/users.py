@@ -0,0 +1,82 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session, make_transient_to_detached
+
+
+class UserCache:
+    """
+    Column values of recently loaded users, so Flask-Login's user_loader
+    doesn't query the user row on every request.
+
+    Entries are dropped when a User row is updated or deleted through the ORM
+    (see register_invalidation), by callers that change users with bulk
+    UPDATEs, and after max_age so other worker processes catch up.
+    """
+
+    def __init__(self, max_age: float = 60.0, max_entries: int = 4096):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id: int, db_session, user_model):
+        """
+        Get a user attached to db_session, from the cache when fresh.
+
+        The cached values are merged into the session without a query, so
+        the returned object behaves like one loaded normally (relationships
+        still lazy-load).
+        """
+        with self._lock:
+            cached = self._users.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] <= self.max_age:
+            user = user_model(**cached[1])
+            make_transient_to_detached(user)
+            return db_session.merge(user, load=False)
+
+        user = db_session.get(user_model, user_id)
+        if user is not None:
+            values = {column.key: getattr(user, column.key) for column in user_model.__mapper__.column_attrs}
+            with self._lock:
+                if len(self._users) >= self.max_entries:
+                    self._users.clear()
+                self._users[user_id] = (time.monotonic(), values)
+        return user
+
+    def invalidate(self, user_id: int = None):
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+
+user_cache = UserCache()
+
+
+def register_invalidation(user_model):
+    """
+    Drop cached users whose rows were updated (status, role, ...) or deleted,
+    and revoke their session identities, once the transaction commits.
+    """
+
+    def remember_user(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("changed_users", set()).add(target.id)
+
+    for event_name in ("after_update", "after_delete"):
+        event.listen(user_model, event_name, remember_user)
+
+    @event.listens_for(Session, "after_commit")
+    def invalidate_committed(session):
+        from .identity import revoke
+
+        for user_id in session.info.pop("changed_users", ()):
+            revoke(user_id)
+
+    @event.listens_for(Session, "after_rollback")
+    def forget_rolled_back(session):
+        session.info.pop("changed_users", None)
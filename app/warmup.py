@@ -0,0 +1,109 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import db
+from .availability import availability_cache
+from .conflicts import conflict_index
+from . import assignment
+
+logger = logging.getLogger(__name__)
+
+# Months of availability masks compiled per tutor, from the current one
+WARM_MONTHS = 2
+
+
+def warm_templates(app) -> int:
+    """
+    Compile every template into the Jinja cache.
+
+    Returns:
+        Number of templates compiled
+    """
+    names = [name for name in app.jinja_env.list_templates() if name.endswith(".html")]
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_caches(now: datetime = None) -> int:
+    """
+    Load every tutor's compiled availability (with the masks for the next
+    WARM_MONTHS months) and conflict index. Call inside an app context.
+
+    Returns:
+        Number of tutors loaded
+    """
+    now = now or datetime.utcnow()
+    tutor_ids = assignment.tutor_ids(db.session)
+    for tutor_id in tutor_ids:
+        availability = availability_cache.get(tutor_id, db.session)
+        day = now.date().replace(day=1)
+        for _ in range(WARM_MONTHS):
+            availability.day_mask(day)
+            day = (day + timedelta(days=31)).replace(day=1)
+        conflict_index.load(tutor_id, now)
+    db.session.remove()
+    return len(tutor_ids)
+
+
+def warm_database() -> int:
+    """
+    Read every table and index of the SQLite database once on each engine,
+    so their pages are in the OS cache and in the page cache of a pooled
+    connection (up to the cache_size pragma). Does nothing for other
+    databases. Call inside an app context.
+
+    Returns:
+        Number of tables and indexes read
+    """
+    read = 0
+    for engine in db.engines.values():
+        if engine.dialect.name != "sqlite":
+            continue
+        with engine.connect() as connection:
+            objects = connection.execute(text(
+                "SELECT type, name, tbl_name FROM sqlite_master "
+                "WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_%'"
+            )).all()
+            for kind, name, table in objects:
+                indexed_by = f' INDEXED BY "{name}"' if kind == "index" else ""
+                connection.execute(text(f'SELECT COUNT(*) FROM "{table}"{indexed_by}'))
+                read += 1
+    return read
+
+
+def warm_up(app) -> dict:
+    """
+    Prime the template, availability and conflict caches and the database
+    pages before the first request. With a preforking server, run it in the
+    master (gunicorn preload_app) so workers inherit the caches; pooled
+    connections are closed at the end so none are shared across the fork.
+
+    Returns:
+        Seconds spent on each stage
+    """
+    timings = {}
+    stages = (
+        ("templates", lambda: warm_templates(app)),
+        ("caches", warm_caches),
+        ("database", warm_database),
+    )
+    with app.app_context():
+        for name, stage in stages:
+            start = time.perf_counter()
+            try:
+                count = stage()
+            except SQLAlchemyError:
+                # e.g. migrations not applied yet; serve anyway, just cold
+                logger.exception("Warm-up stage %s failed", name)
+                count = None
+            timings[name] = round(time.perf_counter() - start, 3)
+            logger.info("Warm-up %s: %s items in %.3fs", name, count, timings[name])
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    return timings
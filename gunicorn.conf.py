@@ -0,0 +1,52 @@
+"""
+gunicorn settings: `gunicorn -c gunicorn.conf.py`. Worker class and counts
+come from app/config.py (WEB_WORKER_CLASS, WEB_WORKERS, WEB_CONNECTIONS,
+WEB_THREADS, WEB_BIND env vars).
+
+The default is a single gevent worker (needs the gevent package). Every open
+/api/events stream is then a greenlet rather than a thread, and since the
+event broker is in-process, a single process means every client hears every
+publish. With WEB_WORKER_CLASS=gthread each stream pins one of the
+WEB_WORKERS x WEB_THREADS threads for as long as the tab is open.
+"""
+import os
+
+if os.environ.get("WEB_WORKER_CLASS", "gevent") == "gevent":
+    # Patch before the app is preloaded, so the locks and queues its modules
+    # create at import are gevent-aware
+    from gevent import monkey
+
+    monkey.patch_all()
+
+from app.config import Config
+
+wsgi_app = "wsgi:app"
+bind = Config.WEB_BIND
+worker_class = Config.WEB_WORKER_CLASS
+workers = Config.WEB_WORKERS
+worker_connections = Config.WEB_CONNECTIONS
+threads = Config.WEB_THREADS
+
+# Import the app, models and templates and warm the caches once in the
+# master; workers inherit them copy-on-write
+preload_app = True
+
+keepalive = 5
+graceful_timeout = 30
+
+
+def when_ready(server):
+    if workers > 1:
+        server.log.warning(
+            "%d workers: /api/events clients only hear about changes made in "
+            "their own worker process", workers)
+
+
+def post_worker_init(worker):
+    """Prime this worker's own connection pool (the master's was closed before fork)."""
+    app = worker.wsgi
+    if app.config["WARM_UP"]:
+        from app.warmup import warm_database
+
+        with app.app_context():
+            warm_database()
@@ -0,0 +1,32 @@
+"""add booking lookup indexes
+
+Revision ID: a1d4e7b2c9f0
+Revises: c4cb6b59775b
+Create Date: 2026-02-02 10:04:51.118240
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1d4e7b2c9f0'
+down_revision = 'c4cb6b59775b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        # Conflict checks: tutor + status + time range (book_slot, approve_booking)
+        batch_op.create_index('ix_booking_tutor_status_start', ['tutor_id', 'status', 'start_time'], unique=False)
+        # Student upcoming/history pages filter on end_time
+        batch_op.create_index('ix_booking_student_end', ['student_id', 'end_time'], unique=False)
+        # Admin queue and calendar week lookups
+        batch_op.create_index('ix_booking_status_start', ['status', 'start_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_status_start')
+        batch_op.drop_index('ix_booking_student_end')
+        batch_op.drop_index('ix_booking_tutor_status_start')
@@ -0,0 +1,28 @@
+"""add booking series id
+
+Revision ID: a3f6d2b8c517
+Revises: f2c7a9d4e813
+Create Date: 2026-02-26 11:48:19.093264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6d2b8c517'
+down_revision = 'f2c7a9d4e813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('series_id', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_booking_series_id'), ['series_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_series_id'))
+        batch_op.drop_column('series_id')
@@ -0,0 +1,26 @@
+"""add booking student start index
+
+Revision ID: b7e2f9c31d84
+Revises: a1d4e7b2c9f0
+Create Date: 2026-02-09 16:41:27.530912
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f9c31d84'
+down_revision = 'a1d4e7b2c9f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        # Student history is paged newest-first on (start_time, id)
+        batch_op.create_index('ix_booking_student_start', ['student_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_student_start')
@@ -0,0 +1,36 @@
+"""add daily booking stats
+
+Revision ID: b8e4c1f9a276
+Revises: a3f6d2b8c517
+Create Date: 2026-03-02 15:33:08.417926
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4c1f9a276'
+down_revision = 'a3f6d2b8c517'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by `flask backfill-analytics`, then kept up to date by the app
+    op.create_table('daily_booking_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('pending_count', sa.Integer(), nullable=False),
+    sa.Column('accepted_count', sa.Integer(), nullable=False),
+    sa.Column('denied_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('accepted_minutes', sa.Integer(), nullable=False),
+    sa.Column('accepted_revenue_eur', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tutor_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('day', 'tutor_id')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_booking_stats')
@@ -0,0 +1,39 @@
+"""add notification unread counter
+
+Revision ID: d5a8c3e1f672
+Revises: b7e2f9c31d84
+Create Date: 2026-02-16 10:12:44.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a8c3e1f672'
+down_revision = 'b7e2f9c31d84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Start the counters from the notifications that already exist
+    op.execute(
+        'UPDATE "user" SET unread_count = ('
+        'SELECT COUNT(*) FROM notification '
+        'WHERE notification.user_id = "user".id AND NOT notification.is_read)'
+    )
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_user_read_created', ['user_id', 'is_read', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_read_created')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('unread_count')
@@ -0,0 +1,25 @@
+"""add user username lower index
+
+Revision ID: e9b41f7a2d35
+Revises: d5a8c3e1f672
+Create Date: 2026-02-18 09:27:03.641877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b41f7a2d35'
+down_revision = 'd5a8c3e1f672'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Login looks users up by email OR lower(username) in one query
+    op.create_index('ix_user_username_lower', 'user', [sa.text('lower(username)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_username_lower', table_name='user')
@@ -0,0 +1,47 @@
+"""add availability recurrence
+
+Revision ID: f2c7a9d4e813
+Revises: e9b41f7a2d35
+Create Date: 2026-02-23 14:05:51.770342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9d4e813'
+down_revision = 'e9b41f7a2d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('starts_on', sa.Date(), nullable=True))
+        # Room for full RRULEs
+        batch_op.alter_column('repeat_rule', existing_type=sa.String(length=50), type_=sa.String(length=255))
+
+    op.create_table('blocked_date',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=True),
+    sa.Column('end_time', sa.Time(), nullable=True),
+    sa.Column('reason', sa.String(length=120), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('blocked_date', schema=None) as batch_op:
+        batch_op.create_index('ix_blocked_date_user_date', ['user_id', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('blocked_date', schema=None) as batch_op:
+        batch_op.drop_index('ix_blocked_date_user_date')
+
+    op.drop_table('blocked_date')
+
+    with op.batch_alter_table('availability', schema=None) as batch_op:
+        batch_op.alter_column('repeat_rule', existing_type=sa.String(length=255), type_=sa.String(length=50))
+        batch_op.drop_column('starts_on')
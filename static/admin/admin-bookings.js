@@ -53,10 +53,19 @@ function renderBookings(bookings) {
     
     empty.style.display = 'none';
     
-    container.innerHTML = bookings.map(booking => `
+    const toolbar = `
+        <div class="booking-bulk-actions">
+            <label><input type="checkbox" id="booking-select-all"> Select all</label>
+            <button class="booking-action-btn booking-action-approve" data-bulk-action="approve">✓ Approve selected</button>
+            <button class="booking-action-btn booking-action-deny" data-bulk-action="deny">✗ Deny selected</button>
+        </div>
+    `;
+    
+    container.innerHTML = toolbar + bookings.map(booking => `
         <div class="booking-item" data-booking-id="${booking.id}">
             <div class="booking-item-info">
                 <div class="booking-item-header">
+                    <input type="checkbox" class="booking-select" value="${booking.id}">
                     <h3 class="booking-student-name">${escapeHtml(booking.student_name)}</h3>
                     <span class="booking-student-email">${escapeHtml(booking.student_email)}</span>
                 </div>
@@ -97,9 +106,17 @@ function renderBookings(bookings) {
     `).join('');
     
     // Attach event listeners
-    container.querySelectorAll('.booking-action-btn').forEach(btn => {
+    container.querySelectorAll('.booking-action-btn[data-action]').forEach(btn => {
         btn.addEventListener('click', handleBookingAction);
     });
+    container.querySelectorAll('[data-bulk-action]').forEach(btn => {
+        btn.addEventListener('click', handleBulkAction);
+    });
+    document.getElementById('booking-select-all').addEventListener('change', function(event) {
+        container.querySelectorAll('.booking-select').forEach(box => {
+            box.checked = event.target.checked;
+        });
+    });
 }
 
 // Escape HTML to prevent XSS
@@ -145,6 +162,46 @@ function handleBookingAction(event) {
     });
 }
 
+// Approve/deny every selected booking with a single request
+function handleBulkAction(event) {
+    const action = event.target.getAttribute('data-bulk-action');
+    const ids = Array.from(document.querySelectorAll('.booking-select:checked'))
+        .map(box => parseInt(box.value, 10));
+    
+    if (ids.length === 0) {
+        alert('Select at least one booking request.');
+        return;
+    }
+    
+    if (!confirm(`Are you sure you want to ${action} ${ids.length} booking request(s)?`)) {
+        return;
+    }
+    
+    fetch('/api/admin/bookings/bulk', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ actions: ids.map(id => ({ id, action })) })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            const conflicts = data.results.filter(r => r.outcome === 'denied_conflict').length;
+            if (conflicts > 0) {
+                alert(`${conflicts} request(s) overlapped another approved booking and were denied.`);
+            }
+            loadBookings();
+        } else {
+            alert(data.error || `Failed to ${action} bookings`);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert(`Network error. Please try again.`);
+    });
+}
+
 // Load bookings from API
 function loadBookings() {
     fetch('/api/admin/bookings?status=pending')
@@ -165,4 +222,8 @@ function loadBookings() {
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     loadBookings();
+    
+    // Reload the queue when bookings are created or change status
+    const events = new EventSource('/api/events');
+    events.addEventListener('booking', loadBookings);
 });
\ No newline at end of file
@@ -2,7 +2,7 @@ const daysOfWeek = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Sat
 
 
 const DAY_START_HOUR = 8;      // 8:00 AM
-const DAY_END_HOUR = 20;       // 8:00 PM
+const DAY_END_HOUR = 22;       // 10:00 PM
 const SLOT_INTERVAL_MINUTES = 15;
 
 function generateTimeSlots() {
@@ -166,62 +166,41 @@ function checkPastSlots() {
 async function loadBookingColors() {
     try {
         const weekStartISO = currentWeekStart.toISOString();
-        const response = await fetch(`/api/calendar/bookings?week_start=${weekStartISO}`);
+        const response = await fetch(`/api/calendar/grid?week_start=${weekStartISO}`);
         const data = await response.json();
         
-        if (data.success && data.bookings) {
-            applyBookingColors(data.bookings);
+        if (data.success && data.days) {
+            applySlotGrid(data);
         }
     } catch (error) {
         console.error('Error loading booking colors:', error);
     }
 }
 
-function applyBookingColors(bookings) {
-    const cells = document.querySelectorAll('#calendar td[data-date][data-time]');
-    
-    cells.forEach(cell => {
-        const dateStr = cell.getAttribute('data-date');
-        const timeStr = cell.getAttribute('data-time');
-        
-        if (!dateStr || !timeStr || cell.classList.contains('past-slot')) {
-            return;
-        }
-        
-        const slotTime = parseTime(timeStr);
-        const [year, month, day] = dateStr.split('-').map(Number);
-        const slotStart = new Date(year, month - 1, day, slotTime.hours, slotTime.minutes, 0, 0);
-        const slotEnd = new Date(slotStart);
-        slotEnd.setMinutes(slotEnd.getMinutes() + 15); // 15-minute slot
-        
-        // Check if this slot overlaps with any booking
-        let slotStatus = 'available';
-        
-        for (const booking of bookings) {
-            const bookingStart = new Date(booking.start_time);
-            const bookingEnd = new Date(booking.end_time);
+// Paint cells from the server's precomputed slot grid (one status code per cell)
+function applySlotGrid(grid) {
+    const classByCode = {};
+    classByCode[grid.legend.available] = 'slot-available';
+    classByCode[grid.legend.pending] = 'slot-pending';
+    classByCode[grid.legend.accepted] = 'slot-accepted';
+    classByCode[grid.legend.unavailable] = 'slot-unavailable';
+    classByCode[grid.legend.past] = 'past-slot';
+    
+    const rows = document.querySelectorAll('#calendar-body tr');
+    
+    rows.forEach((row, slotIndex) => {
+        const cells = row.querySelectorAll('td');
+        cells.forEach((cell, dayIndex) => {
+            const code = grid.days[dayIndex] && grid.days[dayIndex][slotIndex];
+            const className = classByCode[code];
+            if (!className) return;
             
-            // Check if slot overlaps with booking
-            if (slotStart < bookingEnd && slotEnd > bookingStart) {
-                if (booking.status === 'accepted') {
-                    slotStatus = 'accepted';
-                    break; // Accepted takes priority
-                } else if (booking.status === 'pending' && slotStatus !== 'accepted') {
-                    slotStatus = 'pending';
-                }
+            cell.classList.remove('slot-available', 'slot-pending', 'slot-accepted', 'slot-unavailable');
+            cell.classList.add(className);
+            if (className === 'past-slot') {
+                cell.style.cursor = 'not-allowed';
             }
-        }
-        
-        // Apply color class
-        cell.classList.remove('slot-available', 'slot-pending', 'slot-accepted', 'slot-unavailable');
-        
-        if (slotStatus === 'available') {
-            cell.classList.add('slot-available');
-        } else if (slotStatus === 'pending') {
-            cell.classList.add('slot-pending');
-        } else if (slotStatus === 'accepted') {
-            cell.classList.add('slot-accepted');
-        }
+        });
     });
 }
 
@@ -429,6 +408,10 @@ document.addEventListener('DOMContentLoaded', function() {
     document.querySelector('.booking-modal-overlay').addEventListener('click', closeBookingModal);
     
     setInterval(checkPastSlots, 60000);
+    
+    // Repaint the week when any booking changes instead of polling
+    const events = new EventSource('/api/events');
+    events.addEventListener('booking', loadBookingColors);
 });
 
 let loadingOverlay = null;
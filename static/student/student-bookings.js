@@ -162,4 +162,8 @@ function loadBookings() {
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     loadBookings();
+    
+    // Reload when one of our bookings changes (approved, denied, ...)
+    const events = new EventSource('/api/events');
+    events.addEventListener('booking', loadBookings);
 });
\ No newline at end of file
@@ -48,15 +48,18 @@ function getStatusDisplay(status) {
     return statusMap[status] || { class: 'status-unknown', text: status };
 }
 
-// Render history list
-function renderHistory(bookings) {
+const HISTORY_PAGE_SIZE = 50;
+let historyCursor = null;
+
+// Render a page of history; later pages are appended
+function renderHistory(bookings, append) {
     const container = document.getElementById('history-list');
     const loading = document.getElementById('history-loading');
     const empty = document.getElementById('history-empty');
     
     loading.style.display = 'none';
     
-    if (bookings.length === 0) {
+    if (!append && bookings.length === 0) {
         empty.style.display = 'block';
         container.innerHTML = '';
         return;
@@ -64,7 +67,7 @@ function renderHistory(bookings) {
     
     empty.style.display = 'none';
     
-    container.innerHTML = bookings.map(booking => {
+    const html = bookings.map(booking => {
         const statusInfo = getStatusDisplay(booking.status);
         
         return `
@@ -93,15 +96,48 @@ function renderHistory(bookings) {
             </div>
         `;
     }).join('');
+    
+    if (append) {
+        container.insertAdjacentHTML('beforeend', html);
+    } else {
+        container.innerHTML = html;
+    }
 }
 
-// Load history from API
-function loadHistory() {
-    fetch('/api/student/history')
+// Show a "Load more" button while there are older bookings
+function updateLoadMore() {
+    const container = document.getElementById('history-list');
+    let button = document.getElementById('history-load-more');
+    
+    if (!historyCursor) {
+        if (button) button.remove();
+        return;
+    }
+    
+    if (!button) {
+        button = document.createElement('button');
+        button.id = 'history-load-more';
+        button.className = 'booking-action-btn';
+        button.textContent = 'Load more';
+        button.addEventListener('click', () => loadHistory(true));
+    }
+    container.after(button);
+}
+
+// Load history from API, one page at a time
+function loadHistory(append = false) {
+    const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+    if (append && historyCursor) {
+        params.set('cursor', historyCursor);
+    }
+    
+    fetch(`/api/student/history?${params}`)
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                renderHistory(data.bookings);
+                historyCursor = data.next_cursor;
+                renderHistory(data.bookings, append);
+                updateLoadMore();
             } else {
                 console.error('Failed to load history:', data.error);
             }
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.models import db, User, Booking
+from app.availability import availability_cache
+from app.conflicts import conflict_index
+from app.users import user_cache
+from app.cache import week_cache, grid_cache, feed_cache
+from app.ratelimit import login_ip_limiter, login_account_limiter
+
+# Far enough ahead that no test books in the past
+FUTURE = datetime(2030, 1, 7)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App on a fresh SQLite file, with both engines pointed at it."""
+    uri = f"sqlite:///{tmp_path / 'test.db'}"
+    app = create_app({
+        "TESTING": True,
+        "APP_ENV": "testing",
+        "SQLALCHEMY_DATABASE_URI": uri,
+        "SQLALCHEMY_BINDS": {"read": dict(Config.SQLALCHEMY_BINDS["read"], url=uri)},
+    })
+    with app.app_context():
+        db.create_all()
+
+    yield app
+
+    # Module-level caches outlive the app; IDs restart with every database
+    for cache in (availability_cache, conflict_index, user_cache):
+        cache.invalidate()
+    for cache in (week_cache, grid_cache, feed_cache, login_ip_limiter, login_account_limiter):
+        cache.clear()
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(username, role="student", status="approved"):
+        with app.app_context():
+            user = User(username=username, email=f"{username}@example.com",
+                        password_hash="x", role=role, status=status)
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def make_booking(app):
+    def make_booking(student_id, tutor_id, start_time, minutes=120, status="pending"):
+        with app.app_context():
+            booking = Booking(student_id=student_id, tutor_id=tutor_id, start_time=start_time,
+                              end_time=start_time + timedelta(minutes=minutes),
+                              lesson_minutes=minutes, price_eur=100, status=status)
+            db.session.add(booking)
+            db.session.commit()
+            return booking.id
+    return make_booking
+
+
+@pytest.fixture
+def client_for(app):
+    """Test client logged in as the given user ID."""
+    def client_for(user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["_user_id"] = str(user_id)
+            session["_fresh"] = True
+        return client
+    return client_for
@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app.models import db
+
+from .conftest import FUTURE
+
+
+@contextmanager
+def count_queries(app):
+    """Count the statements run on every engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_admin_bookings_query_count_is_constant(app, make_user, make_booking, client_for):
+    admin_id = make_user("admin", role="admin")
+    client = client_for(admin_id)
+    client.get("/api/admin/bookings")  # loads the admin once, like any first request
+
+    def add_bookings(first, count):
+        for i in range(first, first + count):
+            student_id = make_user(f"student{i}")
+            make_booking(student_id, admin_id, FUTURE + timedelta(hours=3 * i))
+
+    counts = {}
+    first = 0
+    for total in (1, 5, 25):
+        add_bookings(first, total - first)
+        first = total
+        with count_queries(app) as statements:
+            response = client.get("/api/admin/bookings")
+        assert response.status_code == 200
+        assert len(response.json["bookings"]) == total
+        counts[total] = len(statements)
+
+    assert counts[1] == counts[5] == counts[25], counts
+    assert counts[25] == 1, counts  # the one joined query
+
+
+def test_admin_bookings_include_student(app, make_user, make_booking, client_for):
+    admin_id = make_user("admin", role="admin")
+    student_id = make_user("alice")
+    make_booking(student_id, admin_id, FUTURE)
+
+    booking, = client_for(admin_id).get("/api/admin/bookings").json["bookings"]
+    assert booking["student_name"] == "alice"
+    assert booking["student_email"] == "alice@example.com"
+    assert booking["status"] == "pending"
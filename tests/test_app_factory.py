@@ -0,0 +1,28 @@
+import pytest
+
+from app import create_app
+from app.config import Config
+
+
+def build(tmp_path, **config):
+    uri = f"sqlite:///{tmp_path / 'test.db'}"
+    return create_app(dict(config, SQLALCHEMY_DATABASE_URI=uri,
+                           SQLALCHEMY_BINDS={"read": dict(Config.SQLALCHEMY_BINDS["read"], url=uri)}))
+
+
+def test_production_is_the_default_and_has_no_debug_routes(tmp_path):
+    app = build(tmp_path)
+    assert app.config["APP_ENV"] == "production"
+    assert "debug" not in app.blueprints
+    assert app.test_client().get("/create-test-users").status_code == 404
+
+
+@pytest.mark.parametrize("env", ["development", "testing"])
+def test_debug_routes_need_a_development_env(tmp_path, env):
+    assert "debug" in build(tmp_path, APP_ENV=env).blueprints
+    assert "debug" not in build(tmp_path, APP_ENV="staging").blueprints
+
+
+def test_blueprints_setting_is_respected(tmp_path):
+    app = build(tmp_path, APP_ENV="development", BLUEPRINTS=("auth", "api"))
+    assert set(app.blueprints) == {"auth", "api"}
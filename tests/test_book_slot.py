@@ -0,0 +1,29 @@
+import pytest
+
+from .conftest import FUTURE
+
+
+@pytest.fixture
+def student(make_user, client_for):
+    make_user("tutor", role="admin")
+    return client_for(make_user("student"))
+
+
+@pytest.mark.parametrize("body", [
+    {"start_time": FUTURE.isoformat(), "lesson_minutes": "120"},
+    {"start_time": FUTURE.isoformat(), "lesson_minutes": 120.5},
+    {"start_time": 1893974400, "lesson_minutes": 120},
+    {"start_time": [FUTURE.isoformat()], "lesson_minutes": 120},
+    {"start_time": "next tuesday", "lesson_minutes": 120},
+    [FUTURE.isoformat(), 120],
+])
+def test_book_slot_rejects_malformed_input(student, body):
+    response = student.post("/api/book-slot", json=body)
+    assert response.status_code == 400
+    assert response.json["success"] is False
+
+
+def test_book_slot_accepts_utc_suffix(student):
+    response = student.post("/api/book-slot", json={
+        "start_time": FUTURE.replace(hour=10).isoformat() + "Z", "lesson_minutes": 120})
+    assert response.status_code == 201
@@ -0,0 +1,74 @@
+import threading
+from collections import Counter
+
+from app.models import Booking
+
+from .conftest import FUTURE
+
+STUDENTS = 20
+ADMIN_THREADS = 3
+
+
+def run_threads(targets):
+    barrier = threading.Barrier(len(targets))
+
+    def start(target):
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=start, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_concurrent_book_and_approve_accepts_one_booking(app, make_user, client_for):
+    admin_id = make_user("admin", role="admin")
+    student_ids = [make_user(f"student{i}") for i in range(STUDENTS)]
+    slot = {"start_time": FUTURE.replace(hour=10).isoformat(), "lesson_minutes": 120}
+    booked, approvals = [], []
+
+    def student(student_id):
+        response = client_for(student_id).post("/api/book-slot", json=slot)
+        booked.append(response.status_code)
+
+    def admin():
+        # Keep approving whatever has been requested so far while the
+        # students are still booking
+        client = client_for(admin_id)
+        for _ in range(40):
+            for booking_id in range(1, STUDENTS + 1):
+                response = client.post(f"/admin/bookings/{booking_id}/approve")
+                approvals.append(response.status_code)
+
+    run_threads([lambda i=i: student(i) for i in student_ids]
+                + [admin] * ADMIN_THREADS)
+
+    assert 500 not in approvals
+    assert set(booked) <= {201, 400}
+    with app.app_context():
+        statuses = Counter(booking.status for booking in Booking.query.all())
+    assert statuses["accepted"] == 1
+    # Everything that overlapped the accepted lesson was denied, either on
+    # approval or because the slot was already taken when it was requested
+    assert statuses["pending"] == 0
+    assert statuses["accepted"] + statuses["denied"] == booked.count(201)
+
+
+def test_concurrent_approvals_of_one_slot(app, make_user, make_booking, client_for):
+    admin_id = make_user("admin", role="admin")
+    start = FUTURE.replace(hour=14)
+    booking_ids = [make_booking(make_user(f"student{i}"), admin_id, start) for i in range(STUDENTS)]
+    codes = []
+
+    def approve(booking_id):
+        codes.append(client_for(admin_id).post(f"/admin/bookings/{booking_id}/approve").status_code)
+
+    run_threads([lambda b=b: approve(b) for b in booking_ids])
+
+    assert 500 not in codes
+    with app.app_context():
+        statuses = Counter(booking.status for booking in Booking.query.all())
+    assert statuses == {"accepted": 1, "denied": STUDENTS - 1}
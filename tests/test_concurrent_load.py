@@ -0,0 +1,73 @@
+import threading
+import time
+from datetime import timedelta
+
+from app.models import db
+
+from .conftest import FUTURE
+
+WRITERS = 4
+READERS = 4
+BOOKINGS_PER_WRITER = 10
+
+
+def test_engines_use_wal_pragmas(app):
+    with app.app_context():
+        def pragma(bind, name):
+            with db.engines[bind].connect() as connection:
+                return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+        assert pragma(None, "journal_mode") == "wal"
+        assert pragma(None, "synchronous") == 1  # NORMAL
+        assert pragma(None, "busy_timeout") == 5000
+        assert pragma(None, "query_only") == 0
+        assert pragma("read", "query_only") == 1
+
+
+def test_reads_keep_flowing_while_students_book(app, make_user, client_for):
+    make_user("tutor", role="admin")
+    writer_ids = [make_user(f"writer{i}") for i in range(WRITERS)]
+    reader_ids = [make_user(f"reader{i}") for i in range(READERS)]
+    writes, reads, latencies = [], [], []
+    writing = threading.Event()
+    writing.set()
+
+    def writer(index, student_id):
+        client = client_for(student_id)
+        for i in range(BOOKINGS_PER_WRITER):
+            # Every writer on its own day, so none of them conflict
+            start = FUTURE + timedelta(days=index * BOOKINGS_PER_WRITER + i, hours=10)
+            response = client.post("/api/book-slot", json={
+                "start_time": start.isoformat(), "lesson_minutes": 120})
+            writes.append(response.status_code)
+
+    def reader(student_id):
+        client = client_for(student_id)
+        while writing.is_set():
+            start = time.perf_counter()
+            response = client.get("/api/student/bookings")
+            latencies.append(time.perf_counter() - start)
+            reads.append(response.status_code)
+
+    writers = [threading.Thread(target=writer, args=(i, student_id))
+               for i, student_id in enumerate(writer_ids)]
+    readers = [threading.Thread(target=reader, args=(student_id,)) for student_id in reader_ids]
+    started = time.perf_counter()
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join(timeout=60)
+    writing.clear()
+    for thread in readers:
+        thread.join(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    # No "database is locked" failures on either side
+    assert writes == [201] * (WRITERS * BOOKINGS_PER_WRITER)
+    assert reads and set(reads) == {200}
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    summary = f"{len(reads) / elapsed:.0f} reads/s, p99 {p99 * 1000:.1f} ms"
+    # Readers are never queued behind the writers' lock for long
+    assert p99 < 1.0, summary
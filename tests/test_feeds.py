@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+from app.models import db, User
+
+
+def test_feed_names_users_without_a_username_by_email(app, make_user, make_booking, client_for):
+    tutor_id = make_user("tutor", role="admin")
+    with app.app_context():
+        student = User(username=None, email="nameless@example.com", password_hash="x",
+                       role="student", status="approved")
+        db.session.add(student)
+        db.session.commit()
+        student_id = student.id
+    start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(days=2)
+    make_booking(student_id, tutor_id, start, status="accepted")
+
+    url = client_for(tutor_id).get("/api/calendar/feed").json["url"]
+    feed = app.test_client().get(url.replace("http://localhost", "")).data.decode()
+
+    assert "SUMMARY:Lesson with nameless@example.com" in feed
+    assert "None" not in feed
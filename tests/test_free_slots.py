@@ -0,0 +1,93 @@
+import time
+from datetime import time as clock, timedelta
+
+import pytest
+
+from app.models import db, Availability, Booking
+from app.slots import free_windows
+
+from .conftest import FUTURE
+
+
+def add_lessons(tutor_id, student_id, days, per_day=4):
+    """Accepted lessons at 8:00, 11:00, 14:00, ... on each of `days` days."""
+    db.session.add_all(
+        Booking(student_id=student_id, tutor_id=tutor_id,
+                start_time=FUTURE + timedelta(days=day, hours=8 + 3 * i),
+                end_time=FUTURE + timedelta(days=day, hours=10 + 3 * i),
+                lesson_minutes=120, price_eur=100, status="accepted")
+        for day in range(days) for i in range(per_day)
+    )
+    db.session.commit()
+
+
+def test_free_windows_skip_accepted_lessons(app, make_user):
+    tutor_id = make_user("tutor", role="admin")
+    student_id = make_user("student")
+    with app.app_context():
+        add_lessons(tutor_id, student_id, days=1, per_day=2)
+        windows = list(free_windows(tutor_id, FUTURE, FUTURE + timedelta(days=1), 120, db.session))
+    # 10:00-11:00 is too short for a lesson
+    assert windows == [(FUTURE.replace(hour=13), FUTURE.replace(hour=22))]
+
+
+def test_free_windows_benchmark_scales_linearly(app, make_user):
+    tutor_id = make_user("tutor", role="admin")
+    student_id = make_user("student")
+    small, large = 90, 360
+
+    with app.app_context():
+        add_lessons(tutor_id, student_id, days=large)
+
+        def best_of_three(days):
+            end = FUTURE + timedelta(days=days)
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                windows = list(free_windows(tutor_id, FUTURE, end, 120, db.session))
+                timings.append(time.perf_counter() - start)
+            assert len(windows) == days  # the 19:00-22:00 gap each day
+            return min(timings)
+
+        best_of_three(small)  # warm the availability cache
+        ratio = best_of_three(large) / best_of_three(small)
+
+    # 4x the days and bookings: linear is ~4x, quadratic would be ~16x
+    assert ratio < 8, f"{large} days took {ratio:.1f}x as long as {small}"
+
+
+@pytest.fixture
+def two_tutors(app, make_user):
+    student_id = make_user("student")
+    with app.app_context():
+        for name, start, end in (("t1", 8, 14), ("t2", 12, 20)):
+            tutor = make_user(name, role="admin")
+            db.session.add(Availability(user_id=tutor, start_time=clock(start), end_time=clock(end),
+                                        repeat_rule="MO,TU"))
+        db.session.commit()
+    return student_id
+
+
+def test_free_slots_pages_cover_every_window_once(two_tutors, client_for):
+    client = client_for(two_tutors)
+    url = "/api/slots/free?from=2030-01-07T00:00:00&to=2030-01-09T00:00:00"
+    everything = client.get(url).json["slots"]
+
+    paged, cursor = [], None
+    while True:
+        page = client.get(url + "&limit=1" + (f"&cursor={cursor}" if cursor else "")).json
+        paged += page["slots"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(everything) == 4
+    assert paged == everything
+
+
+@pytest.mark.parametrize("limit", ["0", "-1"])
+def test_free_slots_limit_is_at_least_one(two_tutors, client_for, limit):
+    page = client_for(two_tutors).get(
+        f"/api/slots/free?from=2030-01-07T00:00:00&to=2030-01-09T00:00:00&limit={limit}").json
+    assert len(page["slots"]) == 1
+    assert page["next_cursor"]
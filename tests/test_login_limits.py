@@ -0,0 +1,25 @@
+from app.models import db, User
+from app.passwords import hasher
+
+
+def test_account_limit_covers_every_spelling_of_the_account(app, monkeypatch):
+    with app.app_context():
+        db.session.add(User(username="stud", email="stud@example.com", role="student",
+                            status="approved", password_hash=hasher.hash("right password")))
+        db.session.commit()
+
+    verified = []
+    real_verify = hasher.verify
+    monkeypatch.setattr(hasher, "verify", lambda *args: verified.append(args) or real_verify(*args))
+
+    client = app.test_client()
+
+    def login(email, password="wrong password"):
+        return client.post("/login", data={"email": email, "password": password}).status_code
+
+    capacity = app.config["LOGIN_ACCOUNT_LIMIT"]
+    assert [login("stud") for _ in range(capacity)] == [403] * capacity
+    # Same user through its email local part on other domains
+    assert [login(f"stud@a{i}.com") for i in range(5)] == [429] * 5
+    assert login("stud", "right password") == 429
+    assert len(verified) == capacity
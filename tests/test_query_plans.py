@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import and_, or_
+
+from app import queries
+from app.models import db, Booking, User, Notification
+
+from .conftest import FUTURE
+
+
+@pytest.fixture
+def explain(app):
+    with app.app_context():
+        yield queries.explain
+
+
+def uses_index(plan, index):
+    return any(f"USING INDEX {index} " in detail for detail in plan)
+
+
+def test_tutor_overlap_uses_tutor_status_start_index(explain):
+    # accepted_conflict and pending_overlaps
+    for status in ("accepted", "pending"):
+        query = Booking.query.filter(Booking.tutor_id == 1, Booking.status == status)
+        plan = explain(queries.overlapping(query, FUTURE, FUTURE + timedelta(hours=2)))
+        assert uses_index(plan, "ix_booking_tutor_status_start"), plan
+        assert "start_time>? AND start_time<?" in plan[0]
+
+
+def test_active_overlap_uses_status_start_index(explain):
+    # active_bookings_overlapping
+    query = Booking.query.filter(Booking.status.in_(queries.ACTIVE_STATUSES))
+    plan = explain(queries.overlapping(query, FUTURE, FUTURE + timedelta(days=7)))
+    assert uses_index(plan, "ix_booking_status_start"), plan
+
+
+def test_student_upcoming_uses_student_end_index(explain):
+    query = Booking.query.filter(
+        Booking.student_id == 1,
+        Booking.end_time >= FUTURE,
+        Booking.status.in_(queries.ACTIVE_STATUSES)
+    )
+    plan = explain(query)
+    assert uses_index(plan, "ix_booking_student_end"), plan
+
+
+def test_student_past_walks_student_start_index_without_sorting(explain):
+    plan = explain(queries._student_past_query(1, FUTURE))
+    assert uses_index(plan, "ix_booking_student_start"), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def test_notifications_page_uses_user_read_created_index(explain):
+    query = Notification.query.filter(
+        Notification.user_id == 1,
+        Notification.is_read == False,
+        or_(Notification.created_at < FUTURE,
+            and_(Notification.created_at == FUTURE, Notification.id < 10))
+    ).order_by(Notification.created_at.desc(), Notification.id.desc()).limit(20)
+    plan = explain(query)
+    assert uses_index(plan, "ix_notification_user_read_created"), plan
+
+
+def test_login_lookup_uses_email_and_lower_username_indexes(explain):
+    query = User.query.filter(or_(
+        User.email == "a@example.com",
+        db.func.lower(User.username) == "a"
+    ))
+    plan = explain(query)
+    assert uses_index(plan, "ix_user_username_lower"), plan
+    assert not any(detail.startswith("SCAN user") for detail in plan), plan
@@ -0,0 +1,85 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.models import db, Availability
+from app.recurrence import parse_rule, occurrences
+
+MONDAY = date(2030, 1, 7)
+
+
+def dates(repeat_rule, start=MONDAY, days=28, anchor=MONDAY):
+    return list(occurrences(parse_rule(repeat_rule), start, start + timedelta(days=days), anchor))
+
+
+def offsets(result, origin=MONDAY):
+    return [(day - origin).days for day in result]
+
+
+def test_empty_rule_is_every_day():
+    assert offsets(dates("", days=5)) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("repeat_rule", ["MO,WE", "Monday Wednesday", "FREQ=WEEKLY;BYDAY=MO,WE"])
+def test_byday(repeat_rule):
+    assert offsets(dates(repeat_rule, days=14)) == [0, 2, 7, 9]
+
+
+def test_weekly_interval_keeps_the_anchor_phase():
+    rule = "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU"
+    assert offsets(dates(rule)) == [1, 15]
+    # Asking from a later window doesn't shift which weeks are on
+    assert offsets(dates(rule, start=MONDAY + timedelta(days=7))) == [15, 29]
+
+
+def test_daily_interval():
+    assert offsets(dates("FREQ=DAILY;INTERVAL=3", days=10)) == [0, 3, 6, 9]
+
+
+def test_count_is_counted_from_the_anchor():
+    rule = "FREQ=WEEKLY;BYDAY=MO;COUNT=3"
+    assert offsets(dates(rule, days=60)) == [0, 7, 14]
+    # Occurrences before the window still use up the count
+    assert offsets(dates(rule, start=MONDAY + timedelta(days=8), days=60)) == [14]
+
+
+def test_until_is_inclusive():
+    assert offsets(dates("FREQ=DAILY;UNTIL=20300109")) == [0, 1, 2]
+    assert offsets(dates("daily until 2030-01-09")) == [0, 1, 2]
+
+
+def test_exdate_skips_a_day():
+    assert offsets(dates("FREQ=DAILY;EXDATE=20300108", days=3)) == [0, 2]
+
+
+def test_monthly_last_day():
+    result = dates("FREQ=MONTHLY;BYMONTHDAY=-1", start=date(2030, 1, 1), days=90, anchor=date(2030, 1, 1))
+    assert result == [date(2030, 1, 31), date(2030, 2, 28), date(2030, 3, 31)]
+
+
+def test_nothing_before_the_anchor():
+    assert dates("FREQ=DAILY", start=MONDAY - timedelta(days=3), days=5) == [MONDAY, MONDAY + timedelta(days=1)]
+
+
+@pytest.mark.parametrize("repeat_rule", ["FREQ=HOURLY", "FREQ=DAILY;COUNT=x", "FREQ=DAILY;UNTIL=soon"])
+def test_bad_rules_raise(repeat_rule):
+    with pytest.raises(ValueError):
+        parse_rule(repeat_rule)
+
+
+def test_availability_rejects_bad_rules_when_written(app, make_user):
+    tutor_id = make_user("tutor", role="admin")
+    with app.app_context():
+        with pytest.raises(ValueError):
+            Availability(user_id=tutor_id, start_time=time(9), end_time=time(12), repeat_rule="FREQ=HOURLY")
+
+        db.session.add(Availability(user_id=tutor_id, start_time=time(9), end_time=time(12),
+                                    repeat_rule="FREQ=WEEKLY;COUNT=4"))
+        with pytest.raises(ValueError):
+            db.session.commit()
+        db.session.rollback()
+
+        db.session.add(Availability(user_id=tutor_id, start_time=time(9), end_time=time(12),
+                                    repeat_rule="FREQ=WEEKLY;COUNT=4", starts_on=MONDAY))
+        db.session.commit()
+        assert Availability.query.count() == 1
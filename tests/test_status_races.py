@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import analytics
+from app.models import db, Booking
+
+from .conftest import FUTURE
+from .test_booking_race import run_threads
+
+BOOKINGS = 20
+
+
+def rollup_totals(app):
+    with app.app_context():
+        return analytics.summary(db.session, date(2000, 1, 1), date(2100, 1, 1))
+
+
+@pytest.mark.parametrize("other", ["deny", "cancel"])
+def test_approve_racing_deny_or_cancel_changes_each_booking_once(app, make_user, make_booking,
+                                                                 client_for, other):
+    admin_id = make_user("admin", role="admin")
+    student_id = make_user("student")
+    # Separate days, so approvals don't deny each other as conflicts
+    booking_ids = [make_booking(student_id, admin_id, FUTURE + timedelta(days=i)) for i in range(BOOKINGS)]
+    with app.app_context():
+        analytics.rebuild(db.session)
+        db.session.commit()
+
+    other_user, other_url = {
+        "deny": (admin_id, "/admin/bookings/{}/deny"),
+        "cancel": (student_id, "/student/bookings/{}/cancel"),
+    }[other]
+    codes = {booking_id: [] for booking_id in booking_ids}
+
+    def approve(booking_id):
+        response = client_for(admin_id).post(f"/admin/bookings/{booking_id}/approve")
+        codes[booking_id].append(response.status_code)
+
+    def change(booking_id):
+        response = client_for(other_user).post(other_url.format(booking_id))
+        codes[booking_id].append(response.status_code)
+
+    run_threads([lambda b=b: approve(b) for b in booking_ids]
+                + [lambda b=b: change(b) for b in booking_ids])
+
+    for booking_id, results in codes.items():
+        assert sorted(results) in ([200, 400], [200, 409]), (booking_id, results)
+
+    incremental = rollup_totals(app)
+    with app.app_context():
+        assert Booking.query.filter_by(status="pending").count() == 0
+        analytics.rebuild(db.session)
+        db.session.commit()
+    assert incremental == rollup_totals(app)
@@ -0,0 +1,31 @@
+"""
+Production entry point.
+
+    gunicorn -c gunicorn.conf.py    # one gevent worker by default, see gunicorn.conf.py
+    python wsgi.py                  # waitress: one process, WEB_THREADS threads
+
+Both need the serving packages in requirements.txt. Leave APP_ENV unset
+(production, no debug routes) and set a real SECRET_KEY. The development
+server stays `APP_ENV=development flask --app app.app run --debug`.
+"""
+from app import create_app
+from app.warmup import warm_up
+
+app = create_app()
+if "debug" in app.blueprints:
+    app.logger.warning("APP_ENV=%s: the debug routes are served", app.config["APP_ENV"])
+
+# Under gunicorn with preload_app this runs once in the master, before fork
+if app.config["WARM_UP"]:
+    warm_up(app)
+
+
+if __name__ == "__main__":
+    from waitress import serve
+
+    threads = app.config["WEB_THREADS"]
+    # Each open /api/events stream holds one of the threads here
+    app.config["EVENT_STREAM_MAX_SUBSCRIBERS"] = min(
+        app.config["EVENT_STREAM_MAX_SUBSCRIBERS"], threads // 2)
+    host, _, port = app.config["WEB_BIND"].rpartition(":")
+    serve(app, host=host or "0.0.0.0", port=int(port), threads=threads)